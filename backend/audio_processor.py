@@ -1,158 +1,709 @@
 import os
+import re
+import asyncio
+import atexit
+import queue
+import subprocess
 import tempfile
+import threading
 import base64
-from typing import Dict, Any, Optional
+import io
+import json
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union, Tuple, BinaryIO, cast
 from pathlib import Path
 from loguru import logger
 
-from openai import OpenAI
-from pydub import AudioSegment
-from moviepy.editor import VideoFileClip
-from config import settings
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from config import OPENAI_API_KEY, OPENAI_BASE_URL
+
+# Extension lookups, built once at import
+VIDEO_EXTENSIONS = frozenset({'.avi', '.mov', '.mkv'})
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.mpga', '.wav', '.flac', '.m4a', '.ogg'})
+
+# Containers Whisper accepts that may or may not carry a video stream
+WHISPER_CONTAINERS = frozenset({'.mp4', '.mpeg', '.webm'})
+
+# Container formats the Whisper API accepts as-is
+WHISPER_FORMATS = AUDIO_EXTENSIONS | WHISPER_CONTAINERS
+
+# MP4-family containers usually keep their index (moov atom) at the end of the
+# file, which ffmpeg and ffprobe cannot seek to when reading from a pipe
+PIPE_UNSAFE_EXTENSIONS = frozenset({'.mp4', '.m4a', '.mov', '.3gp'})
+
+# Audio codecs Whisper decodes inside those containers
+WHISPER_AUDIO_CODECS = frozenset({'aac', 'mp3', 'mp2', 'opus', 'vorbis', 'flac', 'pcm_s16le'})
+
+# Whisper resamples everything to 16 kHz mono, so anything above that is
+# wasted upload. 24 kbps Opus is transparent for speech at that rate.
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_ENCODE_ARGS = ["-vn", "-ac", "1", "-ar", str(WHISPER_SAMPLE_RATE), "-c:a", "libopus", "-b:a", "24k"]
+
+# Files at or below this size are uploaded untouched if already 16 kHz mono
+NORMALIZE_MAX_BYTES = 1024 * 1024
+
+# An Ogg Opus stream with no audio packets is only its header pages (a few
+# hundred bytes); encoder output this small means ffmpeg decoded nothing
+MIN_ENCODED_AUDIO_BYTES = 1024
+
+# Long recordings are split into roughly this many seconds per Whisper call,
+# with at most PARALLEL_MAX_CONCURRENCY requests in flight (OpenAI rate limits)
+PARALLEL_CHUNK_SECONDS = 60
+PARALLEL_MAX_CONCURRENCY = 8
+
+# Transcription is network-bound, so batch jobs can keep many calls in flight
+BATCH_TRANSCRIBE_WORKERS = 16
+
+# base64 is decoded in windows of about this many characters
+BASE64_DECODE_WINDOW = 64 * 1024
+
+# Something Whisper can upload: a file path or a (filename, file object) pair
+AudioSource = Union[str, Tuple[str, BinaryIO]]
+
+_SILENCE_RE = re.compile(r"silence_(start|end): (-?[\d.]+)")
+
+# Characters b64decode discards by default (line wrapping, other whitespace)
+_BASE64_IGNORED_RE = re.compile(r"[^A-Za-z0-9+/=]+")
+
+class _TempFilePool:
+    """
+    Bounded pool of reusable temp file paths, keyed by suffix
+
+    Recycling a fixed set of paths avoids a create/unlink pair (and the
+    inode churn that goes with it) for every conversion.
+    """
+
+    def __init__(self, max_size: int = 16):
+        self.max_size = max_size
+        self._queues: Dict[str, queue.Queue] = {}
+        self._lock = threading.Lock()
+
+    def _queue_for(self, suffix: str) -> queue.Queue:
+        with self._lock:
+            if suffix not in self._queues:
+                self._queues[suffix] = queue.Queue(maxsize=self.max_size)
+            return self._queues[suffix]
+
+    def acquire(self, suffix: str) -> str:
+        """Return an empty temp file path with the given suffix"""
+        try:
+            return self._queue_for(suffix).get_nowait()
+        except queue.Empty:
+            fd, path = tempfile.mkstemp(suffix=suffix)
+            os.close(fd)
+            return path
+
+    def release(self, path: str) -> None:
+        """Truncate the file and hand it back to the pool (unlinked if the pool is full)"""
+        try:
+            os.truncate(path, 0)
+            self._queue_for(Path(path).suffix).put_nowait(path)
+        except (OSError, queue.Full):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def close(self) -> None:
+        """Unlink every pooled file"""
+        with self._lock:
+            queues = list(self._queues.values())
+        for pool in queues:
+            while True:
+                try:
+                    path = pool.get_nowait()
+                except queue.Empty:
+                    break
+                if os.path.exists(path):
+                    os.unlink(path)
+
+class MappedFile(io.RawIOBase):
+    """
+    Read-only file object backed by an mmap of the file
+
+    The HTTPS upload goes through TLS, which rules out sendfile(2); reading
+    from mapped pages at least skips the buffered read() copy. Seek/tell
+    are implemented so httpx can still compute Content-Length.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.name = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._map) if size is None or size < 0 else min(self._pos + size, len(self._map))
+        data = self._map[self._pos:end]
+        self._pos = end
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._map)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._map.close()
+        super().close()
+
+class FfmpegStream(io.RawIOBase):
+    """
+    Readable stream over ffmpeg's stdout, so an upload can start while ffmpeg
+    is still encoding
+
+    fileno/seek are deliberately unsupported: httpx then sends the body with
+    chunked encoding instead of trusting a pipe's zero st_size.
+    """
+
+    def __init__(self, cmd: List[str]):
+        super().__init__()
+        self.cmd = cmd
+        self._process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._eof = False
+
+        # Read the first block up front so startup failures (bad input)
+        # raise here rather than mid-upload
+        self._pending = self._process.stdout.read1(64 * 1024)
+        if not self._pending:
+            self._finish()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._pending:
+            data, self._pending = self._pending[:len(buffer)], self._pending[len(buffer):]
+        elif self._eof:
+            return 0
+        else:
+            data = self._process.stdout.read1(len(buffer))
+            if not data:
+                self._finish()
+                return 0
+        buffer[:len(data)] = data
+        return len(data)
+
+    def _finish(self) -> None:
+        """Reap ffmpeg once its output is exhausted"""
+        self._eof = True
+        self._process.stdout.close()
+        if self._process.wait() != 0:
+            raise subprocess.CalledProcessError(self._process.returncode, self.cmd)
+
+    def close(self) -> None:
+        if not self.closed and not self._eof:
+            # Abandoned before EOF (e.g. upload failed): stop ffmpeg
+            self._process.kill()
+            self._process.stdout.close()
+            self._process.wait()
+        super().close()
+
+def open_for_upload(path: str) -> BinaryIO:
+    """Open a file for upload, memory-mapped when possible (empty files cannot be mapped)"""
+    if os.path.getsize(path) > 0:
+        return MappedFile(path)
+    return open(path, "rb")
+
+temp_file_pool = _TempFilePool()
+atexit.register(temp_file_pool.close)
+
+# One client per process so keep-alive connections to the API are reused
+# across processors and requests instead of paying a TLS handshake each time
+openai_client = OpenAI(
+    api_key=OPENAI_API_KEY,
+    base_url=OPENAI_BASE_URL,
+    http_client=httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    )
+)
+
+def choose_cut_points(duration: float, silences: List[float], chunk_seconds: float) -> List[float]:
+    """
+    Pick split points about every chunk_seconds, snapping to the nearest
+    silence within a quarter chunk so words are not cut in half
+    """
+    tolerance = chunk_seconds / 4
+    cuts: List[float] = []
+    target = chunk_seconds
+    while target < duration:
+        previous = cuts[-1] if cuts else 0.0
+        candidates = [t for t in silences if abs(t - target) <= tolerance and t > previous]
+        cut = min(candidates, key=lambda t: abs(t - target)) if candidates else target
+        cuts.append(cut)
+        target = cut + chunk_seconds
+    return cuts
+
+def decode_base64_chunked(base64_data: str, window: int = BASE64_DECODE_WINDOW) -> io.BytesIO:
+    """
+    Decode base64 text into a buffer one window at a time
+
+    Characters b64decode would skip (e.g. MIME-style line breaks) are
+    dropped first, and anything past the last whole 4-character group
+    carries over to the next window, so each window decodes independently
+    and only one small intermediate bytes object is alive at once.
+    """
+    buffer = io.BytesIO()
+    carry = ""
+    for start in range(0, len(base64_data), window):
+        chunk = carry + _BASE64_IGNORED_RE.sub("", base64_data[start:start + window])
+        usable = len(chunk) - len(chunk) % 4
+        buffer.write(base64.b64decode(chunk[:usable]))
+        carry = chunk[usable:]
+    if carry:
+        # Truncated input: let b64decode raise its usual error
+        buffer.write(base64.b64decode(carry))
+    buffer.seek(0)
+    return buffer
+
+def run_coroutine_sync(coro):
+    """Run a coroutine to completion from sync code, even inside an event loop thread"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # Already inside a running loop: give the coroutine its own loop in a worker thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 class AudioProcessor:
     def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
+        self.client = openai_client
     
-    def process_audio_file(self, file_path: str, filename: str) -> Dict[str, Any]:
+    def process_audio_file(self, file_path: str, filename: str, duration: Optional[float] = None) -> Dict[str, Any]:
         """
         Process audio file: convert format and transcribe speech to text
 
         Args:
             file_path: Audio file path
             filename: Original filename
+            duration: Duration in seconds if already probed (skips a second ffprobe run)
 
         Returns:
             Dictionary containing transcription results
         """
         try:
-            logger.info(f"Starting audio file processing: {filename}")
+            logger.info("Starting audio file processing: {}", filename)
 
             # Detect file type
             file_ext = Path(filename).suffix.lower()
-            logger.info(f"File format: {file_ext}")
-
-            # Convert to supported audio format
-            audio_path = self._convert_to_audio(file_path, file_ext)
-
-            # Speech to text
-            transcription = self._transcribe_audio(audio_path)
-
-            # Clean up temporary file
-            if audio_path != file_path:
-                os.unlink(audio_path)
+            logger.debug("File format: {}", file_ext)
+
+            if not duration:
+                duration = self._get_audio_duration(file_path, file_ext)
+
+            # Convert to supported audio format. Short recordings are streamed from
+            # ffmpeg straight into the upload; long ones need a file on disk to be
+            # split into chunks.
+            audio = self._convert_to_audio(file_path, file_ext, in_memory=duration <= PARALLEL_CHUNK_SECONDS)
+
+            try:
+                # Speech to text
+                transcription = self._transcribe_converted(audio, duration)
+            finally:
+                # Clean up temporary file / encoder stream
+                if isinstance(audio, tuple):
+                    audio[1].close()
+                elif audio != file_path:
+                    temp_file_pool.release(audio)
 
             result = {
                 "filename": filename,
                 "transcription": transcription,
-                "duration": self._get_audio_duration(file_path, file_ext),
+                "duration": duration,
                 "format": file_ext
             }
 
-            logger.info(f"✅ Audio processing complete: {len(transcription)} characters")
+            logger.info("✅ Audio processing complete: {} characters", len(transcription))
             return result
 
         except Exception as e:
-            logger.error(f"❌ Audio processing failed: {e}")
+            logger.error("❌ Audio processing failed: {}", e)
             raise Exception(f"Audio processing failed: {str(e)}")
-    
-    def _convert_to_audio(self, file_path: str, file_ext: str) -> str:
+
+    def process_many(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of audio files
+
+        ffmpeg conversion is CPU-bound and runs in a process pool; Whisper
+        calls are network-bound and run in a thread pool.
+
+        Args:
+            items: (file_path, filename) pairs
+
+        Returns:
+            Transcription result dictionaries, in input order
+        """
+        converted: List[Tuple[str, float]] = []
+        try:
+            logger.info("Starting batch audio processing: {} files", len(items))
+
+            # Spawned, not forked: a forked child would inherit a copy of temp_file_pool's
+            # queued paths, and several children would hand out the same output file
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")) as executor:
+                converted = list(executor.map(_convert_worker, items))
+
+            with ThreadPoolExecutor(max_workers=BATCH_TRANSCRIBE_WORKERS) as executor:
+                transcriptions = list(executor.map(lambda entry: self._transcribe_converted(*entry), converted))
+
+            results = []
+            for (_, filename), (_, duration), transcription in zip(items, converted, transcriptions):
+                results.append({
+                    "filename": filename,
+                    "transcription": transcription,
+                    "duration": duration,
+                    "format": Path(filename).suffix.lower()
+                })
+
+            logger.info("✅ Batch audio processing complete: {} files", len(results))
+            return results
+
+        except Exception as e:
+            logger.error("❌ Batch audio processing failed: {}", e)
+            raise Exception(f"Batch audio processing failed: {str(e)}")
+        finally:
+            # Clean up temporary files, each path once so the pool never holds duplicates
+            inputs = {file_path for file_path, _ in items}
+            for audio_path in {audio_path for audio_path, _ in converted} - inputs:
+                temp_file_pool.release(audio_path)
+
+    def _transcribe_converted(self, audio: AudioSource, duration: float) -> str:
+        """Transcribe converted audio, in parallel chunks if it is long (requires a file path)"""
+        if duration > PARALLEL_CHUNK_SECONDS and isinstance(audio, str):
+            return self._transcribe_audio_parallel(audio, duration)
+        return self._transcribe_audio(audio)
+
+    def _convert_to_audio(self, file_path: str, file_ext: str, in_memory: bool = False) -> AudioSource:
         """
         Convert video file to audio file
 
         Args:
             file_path: Source file path
             file_ext: File extension
+            in_memory: Return converted audio as a (filename, buffer) pair instead of a temp file
 
         Returns:
-            Audio file path
+            Audio file path, or (filename, buffer) when in_memory is set
         """
-        # If video file, extract audio
-        if file_ext in ['.mp4', '.avi', '.mov', '.mkv', '.webm']:
-            logger.info("🎬 Detected video file, extracting audio...")
+        # Whisper-native containers skip extraction when they hold only a supported audio track
+        if file_ext in WHISPER_CONTAINERS:
+            streams = self._probe_streams(file_path)
+            if self._is_whisper_ready(streams):
+                return self._normalize_for_whisper(file_path, in_memory, streams)
 
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_audio_path = temp_file.name
+        # If video file, extract audio
+        if file_ext in VIDEO_EXTENSIONS or file_ext in WHISPER_CONTAINERS:
+            logger.debug("Detected video file, extracting audio")
 
-            # Use moviepy to extract audio
-            video = VideoFileClip(file_path)
-            audio = video.audio
-            audio.write_audiofile(temp_audio_path, verbose=False, logger=None)
-            audio.close()
-            video.close()
+            audio = self._encode_for_whisper(file_path, in_memory)
 
-            logger.info(f"✅ Audio extraction complete: {temp_audio_path}")
-            return temp_audio_path
+            logger.debug("Audio extraction complete")
+            return audio
 
         # If already audio file, check if format conversion is needed
-        elif file_ext in ['.mp3', '.wav', '.flac', '.m4a', '.ogg']:
-            # OpenAI Whisper supports these formats, return directly
-            return file_path
+        elif file_ext in AUDIO_EXTENSIONS:
+            # OpenAI Whisper supports these formats, only shrink them for upload
+            return self._normalize_for_whisper(file_path, in_memory)
 
         else:
-            # Try converting with pydub
-            logger.info(f"🔄 Converting audio format: {file_ext}")
+            # Transcode with ffmpeg straight to Whisper's preferred format
+            logger.debug("Converting audio format: {}", file_ext)
 
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_audio_path = temp_file.name
+            audio = self._encode_for_whisper(file_path, in_memory)
 
-            audio = AudioSegment.from_file(file_path)
-            audio.export(temp_audio_path, format="wav")
+            logger.debug("Format conversion complete")
+            return audio
 
-            logger.info(f"✅ Format conversion complete: {temp_audio_path}")
-            return temp_audio_path
-    
-    def _transcribe_audio(self, audio_path: str) -> str:
+    def _encode_for_whisper(self, file_path: str, in_memory: bool = False) -> AudioSource:
+        """
+        Encode a mono 16 kHz Opus track (Whisper's native rate) with ffmpeg
+
+        Args:
+            file_path: Source audio/video path
+            in_memory: Stream the encoded audio from ffmpeg's stdout instead of a temp file
+
+        Returns:
+            Pooled temp OGG path, or (filename, stream) when in_memory is set
+        """
+        cmd = ["ffmpeg", "-y", "-loglevel", "error", "-threads", "0", "-i", file_path, *WHISPER_ENCODE_ARGS]
+
+        if in_memory:
+            # OGG is streamable, so the pipe needs no seekable output and the
+            # upload overlaps with encoding
+            return (f"{Path(file_path).stem}.ogg", FfmpegStream(cmd + ["-f", "ogg", "pipe:1"]))
+
+        temp_audio_path = temp_file_pool.acquire('.ogg')
+        try:
+            subprocess.run(cmd + [temp_audio_path], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            temp_file_pool.release(temp_audio_path)
+            raise
+        return temp_audio_path
+
+    def _probe_streams(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        List a file's streams with ffprobe
+
+        Args:
+            file_path: Media file path
+
+        Returns:
+            ffprobe stream descriptions, or None if probing failed
+        """
+        try:
+            result = subprocess.run(
+                ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_streams", file_path],
+                capture_output=True,
+                check=True
+            )
+            return json.loads(result.stdout).get("streams", [])
+        except Exception as e:
+            logger.warning("⚠️ Unable to probe media streams: {}", e)
+            return None
+
+    def _is_whisper_ready(self, streams: Optional[List[Dict[str, Any]]]) -> bool:
+        """Whether probed streams are a single Whisper-decodable audio track with no video"""
+        if not streams:
+            return False
+        if any(stream.get("codec_type") == "video" for stream in streams):
+            return False
+        audio_streams = [stream for stream in streams if stream.get("codec_type") == "audio"]
+        return bool(audio_streams) and audio_streams[0].get("codec_name") in WHISPER_AUDIO_CODECS
+
+    def _normalize_for_whisper(
+        self,
+        file_path: str,
+        in_memory: bool = False,
+        streams: Optional[List[Dict[str, Any]]] = None
+    ) -> AudioSource:
+        """
+        Transcode audio to 16 kHz mono Opus to cut upload size
+
+        Args:
+            file_path: Whisper-compatible audio file path
+            in_memory: Return the transcoded audio as a (filename, buffer) pair
+            streams: Already-probed streams, to skip a second ffprobe call
+
+        Returns:
+            Audio to upload (the input path itself if already small enough)
+        """
+        if streams is None:
+            streams = self._probe_streams(file_path)
+
+        try:
+            stream = next(s for s in streams or [] if s.get("codec_type") == "audio")
+            if (int(stream.get("sample_rate", 0)) <= WHISPER_SAMPLE_RATE
+                    and int(stream.get("channels", 0)) == 1
+                    and os.path.getsize(file_path) <= NORMALIZE_MAX_BYTES):
+                return file_path
+        except Exception as e:
+            logger.warning("⚠️ Unable to probe audio stream, normalizing anyway: {}", e)
+
+        audio = self._encode_for_whisper(file_path, in_memory)
+        logger.debug("Normalized audio for upload")
+        return audio
+
+    def _convert_buffer(self, audio_buffer: io.BytesIO) -> io.BytesIO:
+        """
+        Convert in-memory audio to mono 16 kHz Opus by piping it through ffmpeg
+
+        Args:
+            audio_buffer: Source audio data
+
+        Returns:
+            Converted OGG data
+        """
+        logger.debug("Converting in-memory audio via ffmpeg pipe")
+
+        # Feed ffmpeg a view of the buffer rather than a bytes copy of it
+        with audio_buffer.getbuffer() as data:
+            result = subprocess.run(
+                [
+                    "ffmpeg", "-loglevel", "error", "-threads", "0",
+                    "-i", "pipe:0", *WHISPER_ENCODE_ARGS, "-f", "ogg", "pipe:1"
+                ],
+                input=data,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True
+            )
+        # ffmpeg exits 0 on some unreadable input and just writes an empty stream
+        if len(result.stdout) < MIN_ENCODED_AUDIO_BYTES:
+            error = result.stderr.decode("utf-8", errors="replace").strip()
+            raise ValueError(f"ffmpeg produced no audio: {error or 'empty output'}")
+        return io.BytesIO(result.stdout)
+
+    def _transcribe_audio(self, audio: AudioSource) -> str:
         """
         Use OpenAI Whisper for speech-to-text transcription
 
         Args:
-            audio_path: Audio file path
+            audio: Audio file path, or a (filename, buffer) tuple for in-memory data
 
         Returns:
             Transcription text
         """
-        logger.info("🗣️ Starting speech-to-text transcription...")
+        logger.debug("Starting speech-to-text transcription")
 
-        with open(audio_path, "rb") as audio_file:
-            transcript = self.client.audio.transcriptions.create(
+        if isinstance(audio, tuple):
+            # The SDK takes (filename, file) tuples and uploads straight from memory.
+            # A one-shot stream cannot be replayed, so retries are disabled for it.
+            client = self.client if audio[1].seekable() else self.client.with_options(max_retries=0)
+            transcript = client.audio.transcriptions.create(
                 model="whisper-1",
-                file=audio_file,
+                file=audio,
                 response_format="text"
             )
+        else:
+            with open_for_upload(audio) as audio_file:
+                transcript = self.client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=audio_file,
+                    response_format="text"
+                )
 
-        transcription = transcript.strip() if isinstance(transcript, str) else transcript.text.strip()
-        logger.info(f"📝 Transcription result length: {len(transcription)} characters")
+        # response_format="text" makes the SDK return a plain str
+        transcription = cast(str, transcript).strip()
+        logger.debug("Transcription result length: {} characters", len(transcription))
 
         return transcription
 
-    def _get_audio_duration(self, file_path: str, file_ext: str) -> float:
+    def _transcribe_audio_parallel(self, audio_path: str, duration: float, chunk_seconds: float = PARALLEL_CHUNK_SECONDS) -> str:
+        """
+        Split long audio at silences and transcribe the pieces concurrently
+
+        Args:
+            audio_path: Audio file path
+            duration: Audio duration (seconds)
+            chunk_seconds: Target chunk length (seconds)
+
+        Returns:
+            Transcription text, chunks joined in order
+        """
+        with tempfile.TemporaryDirectory() as chunk_dir:
+            chunk_paths = self._split_audio(audio_path, duration, chunk_seconds, chunk_dir)
+            logger.debug("Transcribing {} chunks in parallel", len(chunk_paths))
+            transcription = run_coroutine_sync(self._transcribe_chunks(chunk_paths))
+
+        logger.debug("Transcription result length: {} characters", len(transcription))
+        return transcription
+
+    def _split_audio(self, audio_path: str, duration: float, chunk_seconds: float, output_dir: str) -> List[str]:
+        """
+        Cut audio into Whisper-ready chunks with a single ffmpeg pass
+
+        Args:
+            audio_path: Audio file path
+            duration: Audio duration (seconds)
+            chunk_seconds: Target chunk length (seconds)
+            output_dir: Directory to write the chunks into
+
+        Returns:
+            Chunk file paths in playback order
+        """
+        # silencedetect reports silence_start/silence_end pairs on stderr
+        result = subprocess.run(
+            [
+                "ffmpeg", "-hide_banner", "-nostats", "-i", audio_path,
+                "-af", "silencedetect=noise=-30dB:d=0.5", "-f", "null", "-"
+            ],
+            capture_output=True,
+            text=True
+        )
+        silences = []
+        start = None
+        for kind, value in _SILENCE_RE.findall(result.stderr):
+            if kind == "start":
+                start = float(value)
+            elif start is not None:
+                silences.append((start + float(value)) / 2)
+                start = None
+
+        cuts = choose_cut_points(duration, silences, chunk_seconds)
+
+        cmd = ["ffmpeg", "-y", "-loglevel", "error", "-threads", "0", "-i", audio_path, *WHISPER_ENCODE_ARGS]
+        if cuts:
+            cmd += [
+                "-f", "segment",
+                "-segment_times", ",".join(f"{cut:.3f}" for cut in cuts),
+                "-reset_timestamps", "1"
+            ]
+        cmd.append(os.path.join(output_dir, "chunk_%04d.ogg"))
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        return sorted(str(path) for path in Path(output_dir).glob("chunk_*.ogg"))
+
+    async def _transcribe_chunks(self, chunk_paths: List[str]) -> str:
+        """
+        Transcribe chunk files concurrently, bounded by PARALLEL_MAX_CONCURRENCY
+
+        Args:
+            chunk_paths: Chunk file paths in playback order
+
+        Returns:
+            Transcription text, chunks joined in order
+        """
+        semaphore = asyncio.Semaphore(PARALLEL_MAX_CONCURRENCY)
+
+        # The async client is scoped to this call: its connections belong to the current loop
+        async with AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL) as client:
+            async def transcribe(path: str) -> str:
+                async with semaphore:
+                    with open_for_upload(path) as audio_file:
+                        transcript = await client.audio.transcriptions.create(
+                            model="whisper-1",
+                            file=audio_file,
+                            response_format="text"
+                        )
+                return cast(str, transcript).strip()
+
+            parts = await asyncio.gather(*(transcribe(path) for path in chunk_paths))
+
+        return " ".join(part for part in parts if part)
+
+    def _get_audio_duration(self, file_path: Union[str, io.BytesIO], file_ext: str) -> float:
         """
         Get audio duration (seconds)
 
         Args:
-            file_path: File path
+            file_path: File path or in-memory audio buffer
             file_ext: File extension
 
         Returns:
             Duration (seconds)
         """
         try:
-            if file_ext in ['.mp4', '.avi', '.mov', '.mkv', '.webm']:
-                # Video file
-                video = VideoFileClip(file_path)
-                duration = video.duration
-                video.close()
-                return duration
+            # ffprobe only reads container metadata, no full decode needed
+            cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format"]
+            if isinstance(file_path, str):
+                result = subprocess.run(cmd + [file_path], capture_output=True, check=True)
             else:
-                # Audio file
-                audio = AudioSegment.from_file(file_path)
-                return len(audio) / 1000.0  # Convert to seconds
+                # Feed ffprobe a view of the buffer rather than a bytes copy of it
+                with file_path.getbuffer() as data:
+                    result = subprocess.run(cmd + ["pipe:0"], input=data, capture_output=True, check=True)
+            return float(json.loads(result.stdout)["format"]["duration"])
         except Exception as e:
-            logger.warning(f"⚠️ Unable to get audio duration: {e}")
+            logger.warning("⚠️ Unable to get audio duration: {}", e)
             return 0.0
 
     def process_audio_base64(self, base64_data: str, filename: str) -> Dict[str, Any]:
@@ -166,18 +717,78 @@ class AudioProcessor:
         Returns:
             Dictionary containing transcription results
         """
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix) as temp_file:
-            # Decode base64 data
-            audio_data = base64.b64decode(base64_data)
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
+        file_ext = Path(filename).suffix.lower()
+
+        # Decode straight into an in-memory buffer, window by window
+        audio_buffer = decode_base64_chunked(base64_data)
+
+        duration = 0.0
+        if file_ext not in PIPE_UNSAFE_EXTENSIONS:
+            duration = self._get_audio_duration(audio_buffer, file_ext)
+
+        # Containers that can't be read from a pipe (including any the probe failed on)
+        # and recordings long enough to be split go through the file pipeline instead
+        if not duration or duration > PARALLEL_CHUNK_SECONDS:
+            return self._process_buffer_via_file(audio_buffer, filename, duration)
 
         try:
-            # Process audio file
-            result = self.process_audio_file(temp_file_path, filename)
+            logger.info("Starting in-memory audio processing: {}", filename)
+
+            audio_size = audio_buffer.getbuffer().nbytes
+
+            # Small compatible files go up as-is; everything else is shrunk to Opus first
+            if file_ext in WHISPER_FORMATS and audio_size <= NORMALIZE_MAX_BYTES:
+                upload = (filename, audio_buffer)
+            else:
+                upload = (f"{Path(filename).stem}.ogg", self._convert_buffer(audio_buffer))
+
+            transcription = self._transcribe_audio(upload)
+
+            result = {
+                "filename": filename,
+                "transcription": transcription,
+                "duration": duration,
+                "format": file_ext
+            }
+
+            logger.info("✅ Audio processing complete: {} characters", len(transcription))
             return result
+
+        except Exception as e:
+            logger.error("❌ Audio processing failed: {}", e)
+            raise Exception(f"Audio processing failed: {str(e)}")
+
+    def _process_buffer_via_file(self, audio_buffer: io.BytesIO, filename: str, duration: float = 0.0) -> Dict[str, Any]:
+        """
+        Write decoded audio to a pooled temp file and run process_audio_file on it
+
+        ffmpeg and ffprobe can seek in the file, and long recordings get
+        chunked transcription.
+        """
+        temp_path = temp_file_pool.acquire(Path(filename).suffix.lower())
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(audio_buffer.getbuffer())
+            # A duration already probed from the buffer is reused; 0.0 means probe the file
+            return self.process_audio_file(temp_path, filename, duration)
         finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path) 
\ No newline at end of file
+            temp_file_pool.release(temp_path)
+
+_worker_processor: Optional[AudioProcessor] = None
+
+def _convert_worker(item: Tuple[str, str]) -> Tuple[str, float]:
+    """
+    Process-pool entry point for process_many: convert one file and probe its duration
+
+    Module-level so it can be pickled; each worker process builds its own
+    AudioProcessor once and reuses it. Workers are spawned, so their
+    temp_file_pool starts empty and every output file comes from mkstemp.
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = AudioProcessor()
+
+    file_path, filename = item
+    file_ext = Path(filename).suffix.lower()
+    audio_path = _worker_processor._convert_to_audio(file_path, file_ext)
+    return audio_path, _worker_processor._get_audio_duration(file_path, file_ext)
\ No newline at end of file
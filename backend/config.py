@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     host: str = "localhost"
     port: int = 8000
     debug: bool = True
+    # Uvicorn worker processes outside debug mode; 0 means one per CPU core
+    workers: int = 0
 
     # CORS configuration
     allowed_origins: List[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -32,4 +34,11 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 # Create global configuration instance
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
+
+# Plain constants for hot-path reads, skipping pydantic attribute access
+OPENAI_API_KEY = settings.openai_api_key
+OPENAI_BASE_URL = settings.openai_base_url
+
+# Debug mode runs with reload, which uvicorn can't combine with multiple workers
+SERVER_WORKERS = 1 if settings.debug else (settings.workers or os.cpu_count() or 1) 
\ No newline at end of file
@@ -25,7 +25,8 @@ def setup_environment():
     # Server configuration
     os.environ["HOST"] = "localhost"
     os.environ["PORT"] = "8000"
-    os.environ["DEBUG"] = "True"
+    # Keep an explicit DEBUG=False (from .env or the shell) so production runs can use workers
+    os.environ.setdefault("DEBUG", "True")
 
     # Logging configuration
     os.environ["LOG_LEVEL"] = "INFO"
@@ -1,39 +1,141 @@
 import os
 import json
+import base64
 import asyncio
 import tempfile
 import re
-from typing import List, Dict, Any, AsyncGenerator
+import shutil
+import subprocess
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncGenerator, Optional
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse, Response, JSONResponse, ORJSONResponse
+from pydantic import BaseModel, Field, PrivateAttr
 from dotenv import load_dotenv
 from loguru import logger
 
+# orjson is optional; it serializes SSE frames several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # LangChain imports (using latest version standard approach)
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from langchain_core.callbacks import AsyncCallbackHandler
 
 # Local configuration
-from config import settings
+from config import settings, SERVER_WORKERS
 from pdf_processor import PDFProcessor
-import re
 
 # Load environment variables
 load_dotenv(override=True)
 
-# Configure logging
-logger.add(settings.log_file, rotation="500 MB", level=settings.log_level)
+# Configure logging; enqueue=True hands file writes to a background thread so the event loop never blocks on disk IO.
+# With several uvicorn workers each process gets its own file, since rotation isn't coordinated across processes.
+log_file = settings.log_file
+if SERVER_WORKERS > 1:
+    log_root, log_ext = os.path.splitext(log_file)
+    log_file = f"{log_root}.{os.getpid()}{log_ext}"
+logger.add(
+    log_file,
+    rotation="500 MB",
+    level=settings.log_level,
+    enqueue=True,
+    backtrace=False,
+    diagnose=False
+)
+
+# Streamed tokens are batched into one SSE frame every SSE_FLUSH_TOKENS tokens
+# or SSE_FLUSH_INTERVAL seconds, whichever comes first
+SSE_FLUSH_TOKENS = 8
+SSE_FLUSH_INTERVAL = 0.02
+
+# Maximum accepted PDF size and the chunk size used to spool uploads to disk
+PDF_MAX_BYTES = 50 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+# Largest request bodies worth reading for a PDF, with slack for multipart headers
+# and the other JSON fields; base64 in the legacy JSON body inflates the file by 4/3
+PDF_MAX_MULTIPART_BYTES = PDF_MAX_BYTES + 64 * 1024
+PDF_MAX_JSON_BYTES = PDF_MAX_BYTES * 4 // 3 + 64 * 1024
+
+def _sse(data: Dict[str, Any]) -> bytes:
+    """Encode a payload as one SSE data frame"""
+    if orjson is not None:
+        return b"data: " + orjson.dumps(data) + b"\n\n"
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f"data: {payload}\n\n".encode("utf-8")
+
+# Citation markers such as [1], [2] in model output
+_REF_RE = re.compile(r'\[(\d+)\]')
+
+def _check_pytesseract() -> None:
+    """Check the pytesseract dependency used for OCR of scanned PDF pages"""
+    try:
+        import pytesseract
+        logger.info("✅ pytesseract library installed")
+    except ImportError:
+        logger.warning("⚠️ pytesseract not installed, scanned PDF pages will not be OCR'd")
+        logger.warning("Recommended installation: pip install pytesseract")
+
+def _check_tesseract() -> None:
+    """Check that the Tesseract OCR binary is available"""
+    try:
+        result = subprocess.run(['tesseract', '--version'],
+                              capture_output=True,
+                              text=True,
+                              timeout=5)
+        if result.returncode == 0:
+            version = result.stdout.split('\n')[0]
+            logger.info("✅ Tesseract OCR installed: {}", version)
+        else:
+            logger.warning("⚠️ Tesseract OCR may not be properly installed")
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        logger.warning("⚠️ Tesseract OCR not installed, scanned PDF processing will fail")
+        logger.warning("Installation guide: https://tesseract-ocr.github.io/tessdoc/Installation.html")
+
+# Application lifespan: dependency checks on startup, cleanup on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check required dependencies and configuration on startup"""
+    logger.info("🚀 Starting service...")
+
+    # 1. Check OpenAI API Key
+    if not settings.openai_api_key or settings.openai_api_key == "":
+        logger.error("❌ OPENAI_API_KEY not set!")
+        logger.error("Please set OPENAI_API_KEY in environment variables or .env file")
+        raise RuntimeError("OpenAI API key is required. Please set OPENAI_API_KEY environment variable.")
+    logger.info("✅ OpenAI API key configured")
+
+    # 2-3. Check pytesseract and Tesseract concurrently, off the event loop
+    await asyncio.gather(
+        asyncio.to_thread(_check_pytesseract),
+        asyncio.to_thread(_check_tesseract),
+    )
+
+    # 4. Pre-warm the default chat model so the first request skips client setup
+    get_chat_model(settings.default_model)
+
+    logger.info("✅ Service startup complete!")
+    yield
+
+    # Clean up resources on shutdown
+    logger.info("👋 Service shutting down...")
 
 app = FastAPI(
     title="Multimodal RAG Workbench API",
     description="Intelligent Conversation API based on LangChain 1.0",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # ORJSONResponse needs orjson at render time, so only default to it when installed
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
 )
 
 # CORS configuration
@@ -45,12 +147,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _content_block_part(
+    block_type: str,
+    content: str,
+    transcription: str = "",
+    filename: str = "",
+    filesize: float = 0
+) -> Optional[Dict[str, Any]]:
+    """Map a content block to its LangChain message part, or None if it carries nothing usable"""
+    if block_type == "text":
+        return {"type": "text", "text": content}
+    if block_type == "image":
+        # Only data URLs are forwarded to the model
+        if content.startswith("data:image"):
+            return {"type": "image_url", "image_url": {"url": content}}
+        return None
+    if block_type == "audio":
+        # Audio is sent as its transcription text
+        if transcription:
+            return {"type": "text", "text": f"[Audio Transcription] {transcription}"}
+        return None
+    if block_type == "pdf":
+        # PDF content travels via pdf_chunks, the block only identifies the file
+        return {"type": "text", "text": f"[PDF Document] {filename} ({(filesize or 0) / 1024:.1f} KB)"}
+    return None
+
 # Content block model (multimodal support)
 class ContentBlock(BaseModel):
-    type: str = Field(..., description="Content type: text, image, audio")
+    type: str = Field(..., description="Content type: text, image, audio, pdf")
     content: str = Field(..., description="Content data")
     thumbnail: str = Field(default="", description="Thumbnail (optional)")
     transcription: str = Field(default="", description="Audio transcription text (audio type only)")
+    filename: str = Field(default="", description="File name (pdf type only)")
+    filesize: float = Field(default=0, description="File size in bytes (pdf type only)")
+
+    # LangChain message part, classified once at parse time (None if the block is unusable)
+    _lc_part: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._lc_part = _content_block_part(
+            self.type, self.content, self.transcription, self.filename, self.filesize
+        )
 
 # Request model (multimodal support)
 class MessageRequest(BaseModel):
@@ -87,108 +224,71 @@ try:
     audio_processor = AudioProcessor()
     logger.info("✅ Audio processor initialized successfully")
 except ImportError as e:
-    logger.warning(f"⚠️ Audio processor import failed: {e}")
+    logger.warning("⚠️ Audio processor import failed: {}", e)
     audio_processor = None
 
-# Startup dependency check
-@app.on_event("startup")
-async def startup_event():
-    """Check required dependencies and configuration on startup"""
-    logger.info("🚀 Starting service...")
-
-    # 1. Check OpenAI API Key
-    if not settings.openai_api_key or settings.openai_api_key == "":
-        logger.error("❌ OPENAI_API_KEY not set!")
-        logger.error("Please set OPENAI_API_KEY in environment variables or .env file")
-        raise RuntimeError("OpenAI API key is required. Please set OPENAI_API_KEY environment variable.")
-    logger.info("✅ OpenAI API key configured")
-
-    # 2. Check Unstructured dependency
-    try:
-        from langchain_unstructured import UnstructuredLoader
-        logger.info("✅ Unstructured library installed")
-    except ImportError:
-        logger.warning("⚠️ Unstructured library not installed, PDF OCR functionality may be limited")
-        logger.warning("Recommended installation: pip install unstructured[local-inference]")
-
-    # 3. Check Tesseract OCR
-    import subprocess
-    try:
-        result = subprocess.run(['tesseract', '--version'],
-                              capture_output=True,
-                              text=True,
-                              timeout=5)
-        if result.returncode == 0:
-            version = result.stdout.split('\n')[0]
-            logger.info(f"✅ Tesseract OCR installed: {version}")
-        else:
-            logger.warning("⚠️ Tesseract OCR may not be properly installed")
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        logger.warning("⚠️ Tesseract OCR not installed, scanned PDF processing will fail")
-        logger.warning("Installation guide: https://tesseract-ocr.github.io/tessdoc/Installation.html")
-
-    logger.info("✅ Service startup complete!")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up resources on shutdown"""
-    logger.info("👋 Service shutting down...")
-
 # Reference extraction function
 def extract_references_from_content(content: str, pdf_chunks: list = None) -> list:
     """
     Extract reference information from AI response content
     """
+    # No document context (the common chat case) or no markers: skip the regex scan entirely
+    if not pdf_chunks or '[' not in content:
+        return []
+
     references = []
 
-    # Find all reference markers [1], [2], etc.
-    reference_pattern = r'\[(\d+)\]'
-    matches = re.findall(reference_pattern, content)
-
-    if matches and pdf_chunks:
-        for match in matches:
-            ref_num = int(match)
-            if ref_num <= len(pdf_chunks):
-                chunk = pdf_chunks[ref_num - 1]  # Index starts from 0
-                reference = {
-                    "id": ref_num,
-                    "text": chunk.get("content", "")[:200] + "..." if len(chunk.get("content", "")) > 200 else chunk.get("content", ""),
-                    "source": chunk.get("metadata", {}).get("source", "Unknown source"),
-                    "page": chunk.get("metadata", {}).get("page_number", 1),
-                    "chunk_id": chunk.get("metadata", {}).get("chunk_id", 0),
-                    "source_info": chunk.get("metadata", {}).get("source_info", "Unknown source")
-                }
-                references.append(reference)
+    # Find all reference markers [1], [2], etc.; repeated markers are reported once
+    seen = set()
+    for match in _REF_RE.finditer(content):
+        ref_num = int(match.group(1))
+        if ref_num in seen or ref_num < 1 or ref_num > len(pdf_chunks):
+            continue
+        seen.add(ref_num)
+
+        chunk = pdf_chunks[ref_num - 1]  # Index starts from 0
+        chunk_content = chunk.get("content", "")
+        metadata = chunk.get("metadata", {})
+        reference = {
+            "id": ref_num,
+            "text": chunk_content[:200] + "..." if len(chunk_content) > 200 else chunk_content,
+            "source": metadata.get("source", "Unknown source"),
+            "page": metadata.get("page_number", 1),
+            "chunk_id": metadata.get("chunk_id", 0),
+            "source_info": metadata.get("source_info", "Unknown source")
+        }
+        references.append(reference)
 
     return references
 
+# Bounded, since model_name comes from the client
+@lru_cache(maxsize=16)
+def _build_model(model_name: str) -> ChatOpenAI:
+    """Build a chat model once per model name instead of on every request"""
+    # Use latest version of ChatOpenAI
+    return ChatOpenAI(
+        model=model_name,
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+        temperature=settings.temperature,
+        max_tokens=settings.max_tokens,
+        streaming=True
+    )
+
 # Initialize chat model
 def get_chat_model(model_name: str = None):
-    """Initialize chat model"""
+    """Initialize chat model (cached per model name)"""
     if model_name is None:
         model_name = settings.default_model
 
     try:
-        # Use latest version of ChatOpenAI
-        model = ChatOpenAI(
-            model=model_name,
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url,
-            temperature=settings.temperature,
-            max_tokens=settings.max_tokens,
-            streaming=True
-        )
-        return model
+        return _build_model(model_name)
     except Exception as e:
-        logger.error(f"Model initialization failed: {e}")
+        logger.error("Model initialization failed: {}", e)
         raise HTTPException(status_code=500, detail=f"Model initialization failed: {str(e)}")
 
-def convert_history_to_messages(history: List[Dict[str, Any]]) -> List[BaseMessage]:
-    """Convert history to LangChain message format, with multimodal content support"""
-    messages = []
-
-    # Add system message
-    system_prompt = """You are a professional multimodal RAG assistant with the following capabilities:
+# System prompt shared by every chat request
+_SYSTEM_PROMPT = """You are a professional multimodal RAG assistant with the following capabilities:
 1. Document understanding and analysis
 2. Image content recognition and analysis (OCR, object detection, scene understanding)
 3. Audio transcription and analysis
@@ -210,14 +310,25 @@ Citation format requirements (important):
 
 Please answer in a professional, accurate, and friendly manner, and strictly follow the citation format. When reference documents are available, prioritize using document content in your answers."""
 
-    messages.append(SystemMessage(content=system_prompt))
+_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT)
+
+def _history_message(message_cls, content: Any) -> BaseMessage:
+    """Build a history message, skipping validation only for plain string content"""
+    if isinstance(content, str):
+        return message_cls.model_construct(content=content)
+    return message_cls(content=content)
+
+def convert_history_to_messages(history: List[Dict[str, Any]]) -> List[BaseMessage]:
+    """Convert history to LangChain message format, with multimodal content support"""
+    # Shared system message, built once at import time
+    messages = [_SYSTEM_MESSAGE]
 
     # Convert history messages
-    logger.info(f"Processing history messages: {len(history)} messages")
+    logger.info("Processing history messages: {} messages", len(history))
     for i, msg in enumerate(history):
         content = msg.get("content", "")
         content_blocks = msg.get("content_blocks", [])
-        logger.info(f"History message {i+1}: {msg['role']}, content blocks: {len(content_blocks)}, audio transcription: {any(b.get('transcription') for b in content_blocks)}")
+        logger.debug("History message {}: {}, content blocks: {}", i + 1, msg['role'], len(content_blocks))
         
         if msg["role"] == "user":
             # If multimodal content blocks exist, build composite message
@@ -231,178 +342,156 @@ Please answer in a professional, accurate, and friendly manner, and strictly fol
                         "text": content
                     })
 
-                # Process content blocks
+                # Process content blocks (same classification as ContentBlock). PDF blocks
+                # are left out of history; only the current message carries their label.
                 for block in content_blocks:
-                    if block.get("type") == "text":
-                        message_content.append({
-                            "type": "text",
-                            "text": block.get("content", "")
-                        })
-                    elif block.get("type") == "image":
-                        # Image content block
-                        image_data = block.get("content", "")
-                        if image_data.startswith("data:image"):
-                            message_content.append({
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": image_data
-                                }
-                            })
-                    elif block.get("type") == "audio":
-                        # Audio content block - use transcription text
-                        if block.get("transcription"):
-                            message_content.append({
-                                "type": "text",
-                                "text": f"[Audio Transcription] {block.get('transcription')}"
-                            })
-
-                messages.append(HumanMessage(content=message_content))
+                    block_type = block.get("type", "")
+                    if block_type == "pdf":
+                        continue
+                    part = _content_block_part(
+                        block_type,
+                        block.get("content", ""),
+                        block.get("transcription", "")
+                    )
+                    if part is not None:
+                        message_content.append(part)
+
+                # Content assembled above has a known-good shape, skip Pydantic validation
+                messages.append(HumanMessage.model_construct(content=message_content))
             else:
                 # Plain text message
-                messages.append(HumanMessage(content=content))
+                messages.append(_history_message(HumanMessage, content))
 
         elif msg["role"] == "assistant":
-            messages.append(AIMessage(content=content))
+            messages.append(_history_message(AIMessage, content))
 
     return messages
 
 def create_multimodal_message(request: MessageRequest) -> HumanMessage:
     """Create multimodal message"""
-    logger.info(f"Starting to build multimodal message...")
-    logger.info(f"Text content: {request.content[:100]}..." if request.content else "📝 No text content")
-    logger.info(f"Content blocks count: {len(request.content_blocks)}")
+    logger.debug("Starting to build multimodal message...")
+    logger.debug("Text content length: {}", len(request.content))
+    logger.debug("Content blocks count: {}", len(request.content_blocks))
 
     message_content = []
 
     # Add text content (if any)
     if request.content.strip():
-        logger.info(f"Adding text content")
+        logger.debug("Adding text content")
         message_content.append({
             "type": "text",
             "text": request.content
         })
 
-    # Process content blocks
-    for i, block in enumerate(request.content_blocks):
-        logger.info(f"Processing content block {i+1}/{len(request.content_blocks)}: {block.type}")
-
-        if block.type == "text":
-            logger.info(f"Adding text block: {block.content[:50]}...")
-            message_content.append({
-                "type": "text",
-                "text": block.content
-            })
-        elif block.type == "image":
-            # Image content block
-            if block.content.startswith("data:image"):
-                logger.info(f"Adding image block, data length: {len(block.content)}")
-                message_content.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": block.content
-                    }
-                })
-            else:
-                logger.warning(f"Invalid image data format: {block.content[:50]}...")
-        elif block.type == "audio":
-            # Audio content block - use transcription text directly
-            if block.transcription:
-                logger.info(f"Adding audio transcription text: {block.transcription[:50]}...")
-                message_content.append({
-                    "type": "text",
-                    "text": f"[Audio Transcription] {block.transcription}"
-                })
-            else:
-                logger.warning(f"Audio block missing transcription text")
-        elif block.type == "pdf":
-            # PDF content block - use filename as identifier
-            logger.info(f"Adding PDF block: {block.filename}")
-            message_content.append({
-                "type": "text",
-                "text": f"[PDF Document] {block.filename} ({(block.filesize or 0) / 1024:.1f} KB)"
-            })
-        else:
-            logger.warning(f"Unknown content block type: {block.type}")
+    # Content blocks were classified at parse time, just collect their parts
+    for block in request.content_blocks:
+        part = block._lc_part
+        if part is None:
+            logger.warning("Skipping content block without usable content: {}", block.type)
+            continue
+        logger.debug("Adding {} block", block.type)
+        message_content.append(part)
 
-    logger.info(f"Message construction complete, content blocks count: {len(message_content)}")
+    logger.debug("Message construction complete, content blocks count: {}", len(message_content))
 
     # If only plain text, return string directly
     if len(message_content) == 1 and message_content[0]["type"] == "text":
-        logger.info(f"Returning plain text message")
+        logger.debug("Returning plain text message")
         return HumanMessage(content=message_content[0]["text"])
 
     # Multimodal message
-    logger.info(f"Returning multimodal message")
+    logger.debug("Returning multimodal message")
     return HumanMessage(content=message_content)
 
 async def generate_streaming_response(
     messages: List[BaseMessage],
     model_name: str,
     pdf_chunks: List[Dict[str, Any]] = None
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Generate streaming response"""
     try:
-        logger.info(f"Starting streaming response generation, model: {model_name}")
-        logger.info(f"Message count: {len(messages)}")
+        logger.info("Starting streaming response generation, model: {}", model_name)
+        logger.debug("Message count: {}", len(messages))
 
         # If PDF content exists, add it to system message
         if pdf_chunks and len(pdf_chunks) > 0:
-            logger.info(f"Detected {len(pdf_chunks)} PDF chunks, adding to context")
-            pdf_content = "\n\n=== Reference Document Content ===\n"
+            logger.info("Detected {} PDF chunks, adding to context", len(pdf_chunks))
+            pdf_parts = ["\n\n=== Reference Document Content ===\n"]
             for i, chunk in enumerate(pdf_chunks, 1):
                 content = chunk.get("content", "")[:500]  # Limit length
-                source_info = chunk.get("metadata", {}).get("source_info", f"Document chunk {i}")
-                pdf_content += f"\n[{i}] {content}\nSource: {source_info}\n"
+                metadata = chunk.get("metadata", {})
+                source_info = metadata.get("source_info", f"Document chunk {i}")
+                pdf_parts.append(f"\n[{i}] {content}\nSource: {source_info}\n")
 
-            pdf_content += "\nPlease cite relevant content in your answer using formats like [1], [2], etc.\n"
+            pdf_parts.append("\nPlease cite relevant content in your answer using formats like [1], [2], etc.\n")
+            pdf_content = "".join(pdf_parts)
 
-            # Add PDF content to the last user message
+            # Add PDF content to the last user message, replacing it rather than mutating it in place
             if messages and isinstance(messages[-1], HumanMessage):
-                if isinstance(messages[-1].content, str):
-                    messages[-1].content = messages[-1].content + pdf_content
-                    logger.info(f"Added PDF content to user message, total length: {len(messages[-1].content)}")
-                elif isinstance(messages[-1].content, list):
-                    messages[-1].content.append({"type": "text", "text": pdf_content})
-                    logger.info(f"Added PDF content as new block to user message")
+                last_content = messages[-1].content
+                if isinstance(last_content, str):
+                    messages[-1] = HumanMessage(content=last_content + pdf_content)
+                    logger.debug("Added PDF content to user message, total length: {}", len(messages[-1].content))
+                elif isinstance(last_content, list):
+                    messages[-1] = HumanMessage(content=[*last_content, {"type": "text", "text": pdf_content}])
+                    logger.debug("Added PDF content as new block to user message")
 
         # Log each message type
         for i, msg in enumerate(messages):
             if hasattr(msg, 'content'):
                 if isinstance(msg.content, str):
-                    logger.info(f"Message {i+1}: {type(msg).__name__} - Plain text, length: {len(msg.content)}")
+                    logger.debug("Message {}: {} - Plain text, length: {}", i + 1, type(msg).__name__, len(msg.content))
                 elif isinstance(msg.content, list):
-                    logger.info(f"Message {i+1}: {type(msg).__name__} - Multimodal, block count: {len(msg.content)}")
+                    logger.debug("Message {}: {} - Multimodal, block count: {}", i + 1, type(msg).__name__, len(msg.content))
                     for j, block in enumerate(msg.content):
                         if isinstance(block, dict):
-                            logger.info(f"   Block {j+1}: {block.get('type', 'unknown')}")
+                            logger.debug("   Block {}: {}", j + 1, block.get('type', 'unknown'))
 
         model = get_chat_model(model_name)
-        logger.info(f"Model initialization complete")
+        logger.debug("Model initialization complete")
 
         # Create streaming response
-        full_response = ""
-        logger.info(f"Starting streaming generation...")
+        parts: List[str] = []
+        logger.debug("Starting streaming generation...")
+
+        loop = asyncio.get_running_loop()
+        pending: List[str] = []
+        last_flush = loop.time()
 
         chunk_count = 0
         async for chunk in model.astream(messages):
             chunk_count += 1
-            logger.debug(f"Received chunk {chunk_count}")
+            logger.debug("Received chunk {}", chunk_count)
             if hasattr(chunk, 'content') and chunk.content:
                 content = chunk.content
-                full_response += content
-
-                # Send each chunk's content directly, avoid duplication
-                data = {
-                    "type": "content_delta",
-                    "content": content,
-                    "timestamp": datetime.now().isoformat()
-                }
-                yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+                parts.append(content)
+                pending.append(content)
+
+                # Batch tokens to cut per-frame serialization and event-loop overhead;
+                # deltas carry no timestamp, only message_complete/error do
+                if len(pending) >= SSE_FLUSH_TOKENS or loop.time() - last_flush >= SSE_FLUSH_INTERVAL:
+                    data = {
+                        "type": "content_delta",
+                        "content": "".join(pending)
+                    }
+                    yield _sse(data)
+                    pending.clear()
+                    last_flush = loop.time()
+
+        # Send remaining content
+        if pending:
+            data = {
+                "type": "content_delta",
+                "content": "".join(pending)
+            }
+            yield _sse(data)
 
+        # Join once at the end instead of growing a string per token
+        full_response = "".join(parts)
 
         # Extract reference information
-        references = extract_references_from_content(full_response, pdf_chunks) if pdf_chunks else []
-        logger.info(f"Extracted {len(references)} references")
+        references = extract_references_from_content(full_response, pdf_chunks)
+        logger.info("Extracted {} references", len(references))
 
         # Send completion signal
         final_data = {
@@ -411,26 +500,30 @@ async def generate_streaming_response(
             "timestamp": datetime.now().isoformat(),
             "references": references
         }
-        yield f"data: {json.dumps(final_data, ensure_ascii=False)}\n\n"
+        yield _sse(final_data)
 
     except Exception as e:
-        logger.error(f"Streaming response generation failed: {e}")
+        logger.error("Streaming response generation failed: {}", e)
         error_data = {
             "type": "error",
             "error": str(e),
             "timestamp": datetime.now().isoformat()
         }
-        yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+        yield _sse(error_data)
+
+# Health check payload, serialized once at import time
+_ROOT_RESPONSE = {
+    "message": "Multimodal RAG Workbench API",
+    "version": "1.0.0",
+    "status": "running",
+    "langchain_version": "1.0.0"
+}
+_ROOT_RESPONSE_BODY = json.dumps(_ROOT_RESPONSE, ensure_ascii=False).encode("utf-8")
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {
-        "message": "Multimodal RAG Workbench API",
-        "version": "1.0.0",
-        "status": "running",
-        "langchain_version": "1.0.0"
-    }
+    return Response(content=_ROOT_RESPONSE_BODY, media_type="application/json")
 
 @app.options("/api/chat/stream")
 async def chat_stream_options():
@@ -441,17 +534,16 @@ async def chat_stream_options():
 async def chat_stream(request: MessageRequest):
     """Streaming chat endpoint (multimodal support)"""
     try:
-        # Log request information
-        has_images = any(block.type == "image" for block in request.content_blocks)
+        # Log request information (block count is O(1); block types are logged at DEBUG while building the message)
         content_preview = request.content[:100] if request.content else "Multimodal message"
-        logger.info(f"Received chat request: {content_preview}... (includes images: {has_images})")
+        logger.info("Received chat request: {}... (content blocks: {})", content_preview, len(request.content_blocks))
 
         # PDF chunks reception status
-        logger.info(f"Received PDF chunks count: {len(request.pdf_chunks) if request.pdf_chunks else 0}")
+        logger.info("Received PDF chunks count: {}", len(request.pdf_chunks) if request.pdf_chunks else 0)
         if request.pdf_chunks:
-            logger.info(f"PDF chunks preview: {str(request.pdf_chunks[:2])[:200]}...")
+            logger.opt(lazy=True).debug("PDF chunks preview: {}...", lambda: str(request.pdf_chunks[:2])[:200])
         else:
-            logger.info(f"PDF chunks empty or None: {request.pdf_chunks}")
+            logger.debug("PDF chunks empty or None: {}", request.pdf_chunks)
 
         # Convert message history
         messages = convert_history_to_messages(request.history)
@@ -463,16 +555,17 @@ async def chat_stream(request: MessageRequest):
         # Return streaming response
         return StreamingResponse(
             generate_streaming_response(messages, request.model, request.pdf_chunks),
-            media_type="text/plain",
+            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
-                "Content-Type": "text/event-stream",
+                # Stop nginx-style proxies from buffering the stream
+                "X-Accel-Buffering": "no",
             }
         )
 
     except Exception as e:
-        logger.error(f"Chat request processing failed: {e}")
+        logger.error("Chat request processing failed: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.options("/api/chat")
@@ -485,9 +578,8 @@ async def chat_sync(request: MessageRequest):
     """Synchronous chat endpoint (multimodal support)"""
     try:
         # Log request information
-        has_images = any(block.type == "image" for block in request.content_blocks)
         content_preview = request.content[:100] if request.content else "Multimodal message"
-        logger.info(f"Received synchronous chat request: {content_preview}... (includes images: {has_images})")
+        logger.info("Received synchronous chat request: {}... (content blocks: {})", content_preview, len(request.content_blocks))
 
         # Convert message history
         messages = convert_history_to_messages(request.history)
@@ -508,49 +600,79 @@ async def chat_sync(request: MessageRequest):
         )
 
     except Exception as e:
-        logger.error(f"Synchronous chat request processing failed: {e}")
+        logger.error("Synchronous chat request processing failed: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Static model list, serialized once at import time
+_MODELS_RESPONSE = {
+    "models": [
+        {
+            "id": "gpt-4o",
+            "name": "GPT-4O",
+            "description": "Latest GPT-4 optimized version"
+        },
+        {
+            "id": "gpt-4o-mini",
+            "name": "GPT-4O Mini",
+            "description": "Lightweight GPT-4 version"
+        },
+        {
+            "id": "gpt-5",
+            "name": "GPT-5",
+            "description": "Next-generation GPT model (if available)"
+        }
+    ]
+}
+_MODELS_RESPONSE_BODY = json.dumps(_MODELS_RESPONSE, ensure_ascii=False).encode("utf-8")
+
 @app.get("/api/models")
 async def get_models():
     """Get available model list"""
-    return {
-        "models": [
-            {
-                "id": "gpt-4o",
-                "name": "GPT-4O",
-                "description": "Latest GPT-4 optimized version"
-            },
-            {
-                "id": "gpt-4o-mini",
-                "name": "GPT-4O Mini",
-                "description": "Lightweight GPT-4 version"
-            },
-            {
-                "id": "gpt-5",
-                "name": "GPT-5",
-                "description": "Next-generation GPT model (if available)"
-            }
-        ]
-    }
+    return Response(content=_MODELS_RESPONSE_BODY, media_type="application/json")
+
+# Static knowledge base list, serialized once at import time
+_KNOWLEDGE_BASES_RESPONSE = {
+    "knowledge_bases": [
+        {
+            "id": "default",
+            "name": "Default Knowledge Base",
+            "description": "General knowledge base"
+        },
+        {
+            "id": "technical",
+            "name": "Technical Documentation",
+            "description": "Technical documentation repository"
+        }
+    ]
+}
+_KNOWLEDGE_BASES_RESPONSE_BODY = json.dumps(_KNOWLEDGE_BASES_RESPONSE, ensure_ascii=False).encode("utf-8")
 
 @app.get("/api/knowledge-bases")
 async def get_knowledge_bases():
     """Get knowledge base list"""
-    return {
-        "knowledge_bases": [
-            {
-                "id": "default",
-                "name": "Default Knowledge Base",
-                "description": "General knowledge base"
-            },
-            {
-                "id": "technical",
-                "name": "Technical Documentation",
-                "description": "Technical documentation repository"
-            }
-        ]
-    }
+    return Response(content=_KNOWLEDGE_BASES_RESPONSE_BODY, media_type="application/json")
+
+def _strip_data_url(content: str) -> str:
+    """Return the base64 payload of a data URL (data:...;base64,...), or the input unchanged"""
+    # One scan + one slice; split(',') would materialize a list over the whole payload
+    idx = content.find(',') if content.startswith('data:') else -1
+    return content[idx + 1:] if idx >= 0 else content
+
+def _spool_to_named_file(src, suffix: str) -> str:
+    """Copy a file object to a named temp file in chunks and return its path"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        try:
+            shutil.copyfileobj(src, tmp_file, UPLOAD_CHUNK_BYTES)
+        except BaseException:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+        return tmp_file.name
+
+def _remove_file(path: Optional[str]) -> None:
+    """Delete a temp file if it exists"""
+    if path and os.path.exists(path):
+        os.unlink(path)
 
 @app.options("/api/pdf/process")
 async def process_pdf_stream_options():
@@ -558,61 +680,93 @@ async def process_pdf_stream_options():
     return {"status": "ok"}
 
 @app.post("/api/pdf/process")
-async def process_pdf_stream(file_data: Dict[str, Any]):
+async def process_pdf_stream(request: Request):
     """
     Stream PDF document processing
+
+    Accepts a multipart upload (field "file"), handed to the processor as a file
+    on disk, or for backward compatibility a JSON body with base64 "content" and
+    "filename".
     """
+    tmp_path = None
     try:
-        # Extract request data
-        content = file_data.get("content", "")  # base64-encoded PDF content
-        filename = file_data.get("filename", "document.pdf")
+        is_multipart = request.headers.get("content-type", "").startswith("multipart/form-data")
 
-        if not content:
-            raise HTTPException(status_code=400, detail="Missing PDF content")
+        # Reject oversized bodies before reading them; request.form() would otherwise
+        # spool the whole upload to disk before the size could be checked
+        content_length = request.headers.get("content-length", "")
+        max_body = PDF_MAX_MULTIPART_BYTES if is_multipart else PDF_MAX_JSON_BYTES
+        if content_length.isdigit() and int(content_length) > max_body:
+            raise HTTPException(status_code=400, detail="PDF file too large, maximum supported is 50MB")
 
-        # Decode base64 data
-        import base64
-        try:
-            # Check for data URL prefix
-            if content.startswith('data:'):
-                # Has data URL prefix (data:application/pdf;base64,...)
-                pdf_bytes = base64.b64decode(content.split(',')[-1])
-            else:
-                # Pure base64 data
-                pdf_bytes = base64.b64decode(content)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"PDF data decode failed: {str(e)}")
+        if is_multipart:
+            form = await request.form()
+            try:
+                upload = form.get("file")
+                if upload is None or isinstance(upload, str):
+                    raise HTTPException(status_code=400, detail="Missing PDF file")
+                filename = upload.filename or "document.pdf"
+
+                # The form spools the upload into an anonymous temp file; give it a name so
+                # the processor and its OCR workers open it from disk instead of receiving
+                # the whole PDF in memory
+                tmp_path = await asyncio.to_thread(_spool_to_named_file, upload.file, '.pdf')
+                size = os.path.getsize(tmp_path)
+            finally:
+                await form.close()
+            pdf_source = tmp_path
+        else:
+            try:
+                file_data = await request.json()
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+            if not isinstance(file_data, dict):
+                raise HTTPException(status_code=400, detail="Invalid JSON body: expected an object")
+
+            # Extract request data
+            content = file_data.get("content", "")  # base64-encoded PDF content
+            filename = file_data.get("filename", "document.pdf")
 
-        # Validate file size (50MB limit)
-        max_size = 50 * 1024 * 1024  # 50MB
-        if len(pdf_bytes) > max_size:
+            if not content:
+                raise HTTPException(status_code=400, detail="Missing PDF content")
+
+            # Decode base64 data (with or without a data URL prefix) off the event loop
+            try:
+                pdf_bytes = await asyncio.to_thread(base64.b64decode, _strip_data_url(content))
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"PDF data decode failed: {str(e)}")
+            size = len(pdf_bytes)
+            pdf_source = pdf_bytes
+
+        # Validate file size (50MB limit); also covers bodies sent without a Content-Length
+        if size > PDF_MAX_BYTES:
             raise HTTPException(
                 status_code=400,
-                detail=f"PDF file too large: {len(pdf_bytes) / 1024 / 1024:.1f}MB, maximum supported is 50MB"
+                detail=f"PDF file too large: {size / 1024 / 1024:.1f}MB, maximum supported is 50MB"
             )
 
-        logger.info(f"Starting PDF processing: {filename}, size: {len(pdf_bytes)} bytes")
+        logger.info("Starting PDF processing: {}, size: {} bytes", filename, size)
 
         # Define streaming response generator
         async def generate_pdf_stream():
             try:
-                async for chunk in pdf_processor.process_pdf_stream(pdf_bytes, filename):
-                    chunk_data = json.dumps(chunk, ensure_ascii=False)
-                    yield f"data: {chunk_data}\n\n"
+                async for chunk in pdf_processor.process_pdf_stream(pdf_source, filename):
+                    yield _sse(chunk)
 
                     # If error, terminate immediately
                     if chunk.get("type") == "error":
                         break
 
             except Exception as e:
-                logger.error(f"PDF streaming processing failed: {str(e)}")
-                error_chunk = json.dumps({
+                logger.error("PDF streaming processing failed: {}", e)
+                yield _sse({
                     "type": "error",
                     "error": f"Error occurred during processing: {str(e)}"
-                }, ensure_ascii=False)
-                yield f"data: {error_chunk}\n\n"
+                })
+            finally:
+                _remove_file(tmp_path)
 
-            yield "data: [DONE]\n\n"
+            yield b"data: [DONE]\n\n"
 
         return StreamingResponse(
             generate_pdf_stream(),
@@ -620,14 +774,17 @@ async def process_pdf_stream(file_data: Dict[str, Any]):
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
                 # CORS handled by CORSMiddleware, no need to set manually
             }
         )
 
     except HTTPException:
+        _remove_file(tmp_path)
         raise
     except Exception as e:
-        logger.error(f"PDF processing endpoint error: {str(e)}")
+        _remove_file(tmp_path)
+        logger.error("PDF processing endpoint error: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/pdf/pages")
@@ -642,14 +799,13 @@ async def extract_pdf_pages(file_data: Dict[str, Any]):
         if not content:
             raise HTTPException(status_code=400, detail="Missing PDF content")
 
-        # Decode PDF data
-        import base64
+        # Decode PDF data off the event loop
         try:
-            pdf_bytes = base64.b64decode(content.split(',')[-1])
+            pdf_bytes = await asyncio.to_thread(base64.b64decode, _strip_data_url(content))
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"PDF data decode failed: {str(e)}")
 
-        logger.info(f"Extracting PDF page images, max {max_pages} pages")
+        logger.info("Extracting PDF page images, max {} pages", max_pages)
 
         # Extract page images
         page_images = await pdf_processor.extract_pdf_pages_as_images(pdf_bytes, max_pages)
@@ -657,11 +813,12 @@ async def extract_pdf_pages(file_data: Dict[str, Any]):
         return {
             "success": True,
             "total_pages": len(page_images),
-            "images": page_images
+            "images": page_images,
+            "format": "jpeg"
         }
 
     except Exception as e:
-        logger.error(f"PDF page extraction failed: {str(e)}")
+        logger.error("PDF page extraction failed: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ================================
@@ -676,7 +833,7 @@ async def process_audio(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail="Audio processor not initialized, please check dependencies")
 
     try:
-        logger.info(f"🎙️ Starting audio processing: {file.filename}")
+        logger.info("🎙️ Starting audio processing: {}", file.filename)
 
         # Check file type
         allowed_types = {
@@ -687,17 +844,17 @@ async def process_audio(file: UploadFile = File(...)):
         if file.content_type not in allowed_types:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.content_type}")
 
-        # Create temporary file
+        # Create temporary file, copying the upload in chunks to keep memory bounded
         with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
             temp_file_path = temp_file.name
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                temp_file.write(chunk)
 
         try:
-            # Process audio
-            result = audio_processor.process_audio_file(temp_file_path, file.filename)
+            # Process audio in a worker thread; ffmpeg/Whisper work would otherwise stall the event loop
+            result = await asyncio.to_thread(audio_processor.process_audio_file, temp_file_path, file.filename)
 
-            logger.info(f"Audio processing successful: {file.filename}")
+            logger.info("Audio processing successful: {}", file.filename)
             return {
                 "success": True,
                 "filename": result["filename"],
@@ -712,7 +869,7 @@ async def process_audio(file: UploadFile = File(...)):
                 os.unlink(temp_file_path)
 
     except Exception as e:
-        logger.error(f"Audio processing failed: {e}")
+        logger.error("Audio processing failed: {}", e)
         raise HTTPException(status_code=500, detail=f"Audio processing failed: {str(e)}")
 
 if __name__ == "__main__":
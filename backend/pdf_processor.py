@@ -1,240 +1,502 @@
 import base64
-import io
+import hashlib
+import os
+import asyncio
+import atexit
+import multiprocessing
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import fitz  # PyMuPDF
+import numpy as np
 from PIL import Image
-from typing import List, Dict, Any, Iterator, Tuple, AsyncIterator
-from langchain_unstructured import UnstructuredLoader
+from typing import List, Dict, Any, Iterator, Tuple, AsyncIterator, Union, Optional
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 from loguru import logger
-import tempfile
-import os
+from config import SERVER_WORKERS
+
+# Tesseract's OpenMP threading scales poorly; run each instance single-threaded.
+# Must be set before Tesseract is loaded.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+# OCR backends are only needed for scanned pages without a text layer.
+# tesserocr keeps one Tesseract instance loaded across pages; pytesseract spawns
+# a process per image and is the fallback.
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+except ImportError:
+    PyTessBaseAPI = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# Pages whose embedded text is shorter than this are treated as scanned and sent to OCR
+OCR_MIN_CHARS = 100
+OCR_DPI = 300
+
+# pytesseract launches one Tesseract process per call; batches of at least this many
+# pages are handed over as a single list file so Tesseract starts once per batch
+OCR_LIST_FILE_MIN_PAGES = 3
+
+# Text chunking parameters
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+# Page images for multimodal models: JPEG at 150 dpi is a fraction of the size of
+# a lossless PNG and still legible to the model
+PAGE_IMAGE_DPI = 150
+PAGE_IMAGE_FORMAT = "jpeg"
+PAGE_IMAGE_QUALITY = 85
+
+# Rendered page images keyed by (PDF digest, page index, dpi, format), so a page that
+# is sent again in a later turn isn't re-rendered; least recently used is evicted first.
+# A 150 dpi JPEG page is a few hundred KB of base64, which bounds the cache at tens of MB.
+PAGE_IMAGE_CACHE_SIZE = 128
+
+_page_image_cache: "OrderedDict[Tuple[bytes, int, int, str], str]" = OrderedDict()
+_page_image_cache_lock = threading.Lock()
+
+# Scanned pages are OCR'd in parallel worker processes, one batch of pages per
+# worker. With OMP_THREAD_LIMIT=1 each Tesseract uses a single core, so the cores
+# are split across the uvicorn workers, each of which has its own pool.
+OCR_WORKERS = max(1, (os.cpu_count() or 1) // SERVER_WORKERS)
+
+# The pool is created lazily, mid-request, in a threaded server; forking there could
+# copy locks or MuPDF state held by another thread, so workers start from a clean
+# forkserver (spawn where forkserver isn't available, e.g. Windows)
+_OCR_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Return the shared OCR process pool, creating it on first use or after it broke"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, mp_context=_OCR_MP_CONTEXT)
+        return _ocr_pool
+
+def _discard_ocr_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next _get_ocr_pool call builds a fresh one"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is pool:
+            _ocr_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _shutdown_ocr_pool() -> None:
+    """Stop the OCR workers at interpreter exit"""
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown(wait=False, cancel_futures=True)
+
+atexit.register(_shutdown_ocr_pool)
 
 class PDFProcessor:
     """PDF document processor"""
 
     def __init__(self):
         self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
             separators=["\n\n", "\n", " ", ""]
         )
     
-    async def process_pdf_stream(self, file_content: bytes, filename: str) -> AsyncIterator[Dict[str, Any]]:
+    async def process_pdf_stream(self, file_content: Union[bytes, str], filename: str) -> AsyncIterator[Dict[str, Any]]:
         """
         Stream PDF document processing
         Return processing progress and results
+
+        Args:
+            file_content: PDF bytes, or the path of a PDF already on disk (left in place)
+            filename: Original file name
         """
-        tmp_file_path = None
         try:
-            # Step 1: Save temporary file
+            # Step 1: Open document (bytes are read in place, no temp file needed)
             yield {
                 "type": "progress",
                 "step": "saving_file",
-                "message": f"Saving file {filename}...",
+                "message": f"Opening file {filename}...",
                 "progress": 10
             }
 
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                tmp_file.write(file_content)
-                tmp_file_path = tmp_file.name
+            # Step 2: Extract the embedded text layer page by page, off the event loop
+            yield {
+                "type": "progress",
+                "step": "loading_pdf",
+                "message": "Extracting PDF text...",
+                "progress": 30
+            }
+
+            documents, ocr_pages = await asyncio.to_thread(_extract_text_layer, file_content)
 
-            try:
-                # Step 2: Load PDF document
+            # Step 2b: OCR only the pages that have no usable text layer, in parallel
+            ocr_used = False
+            if ocr_pages and (PyTessBaseAPI is not None or pytesseract is not None):
                 yield {
                     "type": "progress",
-                    "step": "loading_pdf",
-                    "message": "Analyzing PDF structure...",
-                    "progress": 30
+                    "step": "ocr",
+                    "message": f"Running OCR on {len(ocr_pages)} scanned pages...",
+                    "progress": 45
                 }
-
-                # Use UnstructuredLoader to load PDF (full OCR configuration)
+                loop = asyncio.get_running_loop()
+                pool = _get_ocr_pool()
+                futures = []
+                ocr_error = None
+                done = 0
                 try:
-                    loader = UnstructuredLoader(
-                        file_path=tmp_file_path,
-                        partition_via_api=False,  # Local processing, no API
-                        strategy="hi_res",  # High-resolution strategy for better complex PDF handling
-                        extract_images_in_pdf=True,  # Enable image extraction
-                        infer_table_structure=True,  # Enable table inference
-                        ocr_languages=["eng"],  # Use English OCR
-                        chunking_strategy="by_title"  # Chunk by title
-                    )
-                except ImportError as e:
-                    error_msg = f"Missing required dependencies: {str(e)}. Please ensure unstructured[local-inference] and Tesseract OCR are installed"
-                    logger.error(error_msg)
-                    yield {
-                        "type": "error",
-                        "error": error_msg
-                    }
-                    return
-                except Exception as e:
-                    error_msg = f"PDF loader initialization failed: {str(e)}"
-                    logger.error(error_msg)
-                    yield {
-                        "type": "error",
-                        "error": error_msg
-                    }
-                    return
+                    # One batch per worker: the PDF is sent and opened once per batch, not per page
+                    batch_size = -(-len(ocr_pages) // OCR_WORKERS)
+                    futures = [
+                        loop.run_in_executor(pool, _ocr_pages, file_content, ocr_pages[i:i + batch_size])
+                        for i in range(0, len(ocr_pages), batch_size)
+                    ]
+                    for future in asyncio.as_completed(futures):
+                        results, error = await future
+                        ocr_error = ocr_error or error
+                        for page_index, text in results:
+                            if len(text.strip()) > len(documents[page_index].page_content.strip()):
+                                documents[page_index].page_content = text
+                                ocr_used = True
+                        done += len(results)
+                        yield {
+                            "type": "progress",
+                            "step": "ocr",
+                            "message": f"OCR {done}/{len(ocr_pages)} pages complete",
+                            "progress": 45 + 14 * done // len(ocr_pages)
+                        }
+                    if ocr_error:
+                        # e.g. Tesseract binary or language data missing
+                        logger.warning("⚠️ Tesseract OCR failed ({}), affected scanned pages were skipped", ocr_error)
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. killed for memory); replace the pool for later uploads
+                    logger.warning("⚠️ OCR worker pool broke ({}), scanned pages will be skipped", e)
+                    _discard_ocr_pool(pool)
+                finally:
+                    # Don't leave queued pages running if we bail out or the client disconnects
+                    for future in futures:
+                        future.cancel()
+            elif ocr_pages:
+                logger.warning("⚠️ No OCR backend installed (tesserocr/pytesseract), scanned pages will be skipped")
 
-                # Load documents
-                documents = []
-                for doc in loader.lazy_load():
-                    documents.append(doc)
+            # Drop pages that are still empty
+            documents = [doc for doc in documents if doc.page_content.strip()]
 
-                logger.info(f"PDF loading complete, total {len(documents)} document blocks")
-                
-                # Step 3: Text chunking
-                yield {
-                    "type": "progress",
-                    "step": "splitting_text",
-                    "message": f"Splitting text, {len(documents)} original blocks...",
-                    "progress": 60
-                }
+            # Step 3: Text chunking
+            yield {
+                "type": "progress",
+                "step": "splitting_text",
+                "message": f"Splitting text, {len(documents)} original blocks...",
+                "progress": 60
+            }
 
-                # Merge all document content and debug output
-                full_text = "\n\n".join([doc.page_content for doc in documents])
-                logger.info(f"Merged text length: {len(full_text)} characters")
-
-                # Debug: output first 200 characters to see what was extracted
-                preview = full_text[:200] if full_text else "Empty content"
-                logger.info(f"Text preview: {repr(preview)}")
-
-                # Check document metadata
-                for i, doc in enumerate(documents):
-                    logger.info(f"Document {i}: length={len(doc.page_content)}, metadata={doc.metadata}")
-                    if doc.page_content:
-                        logger.info(f"Document {i} preview: {repr(doc.page_content[:100])}")
-
-                # Verify extracted content is not empty
-                if not full_text or not full_text.strip():
-                    error_msg = "PDF document extraction failed: Could not extract any text content. This may be a scanned PDF. Please ensure Tesseract OCR is installed and configured correctly."
-                    logger.error(error_msg)
-                    yield {
-                        "type": "error",
-                        "error": error_msg
-                    }
-                    return
+            # Merge all document content, recording where each page ends in the merged text
+            full_text = "\n\n".join([doc.page_content for doc in documents])
+            page_ends = []
+            page_numbers = []
+            offset = 0
+            for doc in documents:
+                offset += len(doc.page_content)
+                page_ends.append(offset)
+                page_numbers.append(doc.metadata.get("page_number", 1))
+                offset += 2  # "\n\n" separator
 
-                # Use RecursiveCharacterTextSplitter for intelligent chunking
-                text_chunks = self.text_splitter.split_text(full_text)
-                logger.info(f"Text chunking complete, total {len(text_chunks)} chunks")
+            # One summary line; per-document details only at DEBUG
+            logger.info(
+                "PDF loading complete: {} document blocks, {} characters, preview={!r}",
+                len(documents), len(full_text), full_text[:120]
+            )
+            for i, doc in enumerate(documents):
+                logger.debug("Document {}: length={}, metadata={}", i, len(doc.page_content), doc.metadata)
 
-                # Step 4: Build document chunks
+            # Page text now lives in full_text; release the per-page copies before splitting
+            documents.clear()
+
+            # Verify extracted content is not empty
+            if not full_text or not full_text.strip():
+                error_msg = "PDF document extraction failed: Could not extract any text content. This may be a scanned PDF. Please ensure Tesseract OCR is installed and configured correctly."
+                logger.error(error_msg)
                 yield {
-                    "type": "progress",
-                    "step": "building_chunks",
-                    "message": f"Building {len(text_chunks)} document chunks...",
-                    "progress": 80
+                    "type": "error",
+                    "error": error_msg
                 }
+                return
 
-                # Build document chunks with metadata (including page number information)
-                document_chunks = []
-                for i, chunk in enumerate(text_chunks):
-                    if chunk.strip():  # Filter empty chunks
-                        # Try to get page number from original document blocks
-                        page_number = 1  # Default page number
-                        if documents:
-                            # Find original document block containing this chunk content
-                            for doc in documents:
-                                if hasattr(doc, 'metadata') and 'page_number' in doc.metadata:
-                                    if chunk.strip()[:50] in doc.page_content:
-                                        page_number = doc.metadata.get('page_number', 1)
-                                        break
-
-                        doc_chunk = {
-                            "id": f"{filename}_{i}",
-                            "content": chunk.strip(),
-                            "metadata": {
-                                "source": filename,
-                                "chunk_id": i,
-                                "chunk_size": len(chunk),
-                                "total_chunks": len(text_chunks),
-                                "page_number": page_number,
-                                "reference_id": f"[{i+1}]",
-                                "source_info": f"{filename} - Page {page_number}"
-                            }
-                        }
-                        document_chunks.append(doc_chunk)
+            # Use RecursiveCharacterTextSplitter for intelligent chunking; text that
+            # already fits in one chunk is used as-is without a splitter pass
+            if len(full_text) <= CHUNK_SIZE:
+                text_chunks = [full_text.strip()]
+            else:
+                text_chunks = self.text_splitter.split_text(full_text)
+            logger.info("Text chunking complete, total {} chunks", len(text_chunks))
 
-                # Step 5: Complete processing
-                yield {
-                    "type": "progress",
-                    "step": "completed",
-                    "message": f"Processing complete! Generated {len(document_chunks)} document chunks",
-                    "progress": 100
-                }
+            # Step 4: Build document chunks
+            yield {
+                "type": "progress",
+                "step": "building_chunks",
+                "message": f"Building {len(text_chunks)} document chunks...",
+                "progress": 80
+            }
 
-                # Return processing results
-                yield {
-                    "type": "result",
-                    "chunks": document_chunks,
-                    "summary": {
-                        "filename": filename,
-                        "total_chunks": len(document_chunks),
-                        "total_characters": sum(len(chunk["content"]) for chunk in document_chunks),
-                        "processing_strategy": "hi_res"
+            # Locate every chunk in the merged text. The splitter emits chunks in order
+            # (overlapping by chunk_overlap), so a forward search from the previous
+            # chunk's start finds each one
+            chunk_starts = []
+            pos = 0
+            for chunk in text_chunks:
+                start = full_text.find(chunk, pos) if chunk else -1
+                if start >= 0:
+                    pos = start + 1
+                else:
+                    start = pos
+                chunk_starts.append(start)
+
+            # Map all chunk starts to the page whose text span contains them in one call
+            page_indices = np.searchsorted(
+                np.asarray(page_ends, dtype=np.int64), np.asarray(chunk_starts, dtype=np.int64), side="right"
+            )
+            chunk_pages = np.asarray(page_numbers, dtype=np.int64)[np.minimum(page_indices, len(page_numbers) - 1)].tolist()
+
+            # Build document chunks with metadata (including page number information)
+            document_chunks = []
+            for i, chunk in enumerate(text_chunks):
+                if chunk.strip():  # Filter empty chunks
+                    page_number = chunk_pages[i]
+
+                    doc_chunk = {
+                        "id": f"{filename}_{i}",
+                        "content": chunk.strip(),
+                        "metadata": {
+                            "source": filename,
+                            "chunk_id": i,
+                            "chunk_size": len(chunk),
+                            "total_chunks": len(text_chunks),
+                            "page_number": page_number,
+                            "reference_id": f"[{i+1}]",
+                            "source_info": f"{filename} - Page {page_number}"
+                        }
                     }
-                }
+                    document_chunks.append(doc_chunk)
 
-            finally:
-                # Clean up temporary file
-                if os.path.exists(tmp_file_path):
-                    os.unlink(tmp_file_path)
+            # Step 5: Complete processing
+            yield {
+                "type": "progress",
+                "step": "completed",
+                "message": f"Processing complete! Generated {len(document_chunks)} document chunks",
+                "progress": 100
+            }
+
+            # Return processing results
+            yield {
+                "type": "result",
+                "chunks": document_chunks,
+                "summary": {
+                    "filename": filename,
+                    "total_chunks": len(document_chunks),
+                    "total_characters": sum(len(chunk["content"]) for chunk in document_chunks),
+                    "processing_strategy": "text+ocr" if ocr_used else "text"
+                }
+            }
 
         except Exception as e:
-            logger.error(f"PDF processing failed: {str(e)}")
+            logger.error("PDF processing failed: {}", e)
             yield {
                 "type": "error",
                 "error": f"PDF processing failed: {str(e)}"
             }
     
-    def pdf_page_to_base64(self, pdf_content: bytes, page_number: int) -> str:
+    def pdf_page_to_base64(
+        self,
+        pdf_content: bytes,
+        page_number: int,
+        dpi: int = PAGE_IMAGE_DPI,
+        format: str = PAGE_IMAGE_FORMAT
+    ) -> str:
         """
         Convert PDF page to base64-encoded image
         For multimodal model processing
+
+        Args:
+            pdf_content: PDF bytes
+            page_number: 1-based page number
+            dpi: Render resolution
+            format: "jpeg" (default) or "png" for lossless output
         """
         try:
             # Open PDF from memory
             pdf_document = fitz.open(stream=pdf_content, filetype="pdf")
-            page = pdf_document.load_page(page_number - 1)  # 0-based indexing
-            pix = page.get_pixmap()
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-            buffer = io.BytesIO()
-            img.save(buffer, format="PNG")
-            pdf_document.close()
-
-            return base64.b64encode(buffer.getvalue()).decode("utf-8")
+            try:
+                # 0-based indexing
+                return _render_cached(pdf_document, _pdf_digest(pdf_content), page_number - 1, dpi, format)
+            finally:
+                pdf_document.close()
 
         except Exception as e:
-            logger.error(f"PDF page to image conversion failed: {str(e)}")
+            logger.error("PDF page to image conversion failed: {}", e)
             raise
 
-    async def extract_pdf_pages_as_images(self, file_content: bytes, max_pages: int = 5) -> List[str]:
+    async def extract_pdf_pages_as_images(
+        self,
+        file_content: bytes,
+        max_pages: int = 5,
+        dpi: int = PAGE_IMAGE_DPI,
+        format: str = PAGE_IMAGE_FORMAT
+    ) -> List[str]:
         """
         Extract first few PDF pages as images for multimodal processing
+
+        Rendering runs in a worker thread so the event loop stays free. Pages are
+        rendered one after another within that thread: PyMuPDF is not thread-safe
+        and holds the GIL while rendering, so per-page threads would not overlap.
         """
         try:
-            pdf_document = fitz.open(stream=file_content, filetype="pdf")
-            total_pages = len(pdf_document)
-            pages_to_extract = min(max_pages, total_pages)
+            images = await asyncio.to_thread(_render_pages, file_content, max_pages, dpi, format)
+            logger.info("Extracted {} PDF page images", len(images))
+            return images
 
-            images = []
-            for page_num in range(pages_to_extract):
-                page = pdf_document.load_page(page_num)
-                pix = page.get_pixmap()
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        except Exception as e:
+            logger.error("PDF image extraction failed: {}", e)
+            raise
 
-                buffer = io.BytesIO()
-                img.save(buffer, format="PNG")
-                base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
-                images.append(base64_image)
+def _render_pages(file_content: bytes, max_pages: int, dpi: int, format: str) -> List[str]:
+    """Render the first max_pages pages of a PDF to base64 images"""
+    digest = _pdf_digest(file_content)
+    pdf_document = fitz.open(stream=file_content, filetype="pdf")
+    try:
+        pages_to_extract = min(max_pages, len(pdf_document))
+        return [_render_cached(pdf_document, digest, page_num, dpi, format) for page_num in range(pages_to_extract)]
+    finally:
+        pdf_document.close()
 
-            pdf_document.close()
-            logger.info(f"Extracted {len(images)} PDF page images")
-            return images
+def _pdf_digest(pdf_content: bytes) -> bytes:
+    """Content hash identifying a PDF in the page image cache"""
+    return hashlib.blake2b(pdf_content, digest_size=16).digest()
 
-        except Exception as e:
-            logger.error(f"PDF image extraction failed: {str(e)}")
-            raise 
\ No newline at end of file
+def _render_cached(pdf_document: fitz.Document, digest: bytes, page_index: int, dpi: int, format: str) -> str:
+    """Return a page's base64 image from the cache, rendering and storing it on a miss"""
+    key = (digest, page_index, dpi, format)
+    # Renders run in worker threads, so cache access is locked
+    with _page_image_cache_lock:
+        image = _page_image_cache.get(key)
+        if image is not None:
+            _page_image_cache.move_to_end(key)
+            return image
+
+    image = _encode_page(pdf_document.load_page(page_index), dpi, format)
+    with _page_image_cache_lock:
+        _page_image_cache[key] = image
+        if len(_page_image_cache) > PAGE_IMAGE_CACHE_SIZE:
+            _page_image_cache.popitem(last=False)
+    return image
+
+def _encode_page(page: fitz.Page, dpi: int, format: str) -> str:
+    """Render a page and return it base64-encoded, encoded by PyMuPDF directly (no PIL round-trip)"""
+    pix = page.get_pixmap(dpi=dpi)
+    if format == "jpeg":
+        data = pix.tobytes("jpeg", jpg_quality=PAGE_IMAGE_QUALITY)
+    else:
+        data = pix.tobytes(format)
+    return base64.b64encode(data).decode("utf-8")
+
+def _extract_text_layer(pdf_source: Union[bytes, str]) -> Tuple[List[Document], List[int]]:
+    """
+    Read each page's embedded text
+
+    Returns one Document per page plus the indices of pages whose text layer is
+    too short to be useful and need OCR.
+    """
+    if isinstance(pdf_source, str):
+        pdf_document = fitz.open(pdf_source)
+    else:
+        pdf_document = fitz.open(stream=pdf_source, filetype="pdf")
+
+    documents = []
+    ocr_pages = []
+    try:
+        for page in pdf_document:
+            text = page.get_text("text")
+            if len(text.strip()) < OCR_MIN_CHARS:
+                ocr_pages.append(page.number)
+            documents.append(Document(page_content=text, metadata={"page_number": page.number + 1}))
+    finally:
+        pdf_document.close()
+    return documents, ocr_pages
+
+_worker_tess_api = None
+
+def _ocr_image(img: Image.Image) -> str:
+    """
+    Run OCR on a rendered page image
+
+    Uses a persistent tesserocr instance (one per worker process) when available,
+    so the language model is loaded once rather than per page; falls back to pytesseract.
+    """
+    global _worker_tess_api
+    if PyTessBaseAPI is not None:
+        if _worker_tess_api is None:
+            _worker_tess_api = PyTessBaseAPI(lang="eng", psm=PSM.AUTO)
+        _worker_tess_api.SetImage(img)
+        return _worker_tess_api.GetUTF8Text()
+    return pytesseract.image_to_string(img, lang="eng")
+
+def _render_ocr_image(page: fitz.Page) -> Image.Image:
+    """Render a page for OCR; grayscale is lossless for printed text and a third of the RGB bytes"""
+    pix = page.get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY)
+    return Image.frombytes("L", [pix.width, pix.height], pix.samples)
+
+def _ocr_list_file(pdf_document: fitz.Document, page_indices: List[int]) -> Optional[List[str]]:
+    """
+    OCR several pages with a single pytesseract call
+
+    The pages are written to a temp dir as TIFFs and listed in images.txt, which
+    Tesseract processes in one run, separating the pages' text with form feeds.
+    Returns None if the output can't be mapped back to the pages.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for page_index in page_indices:
+            path = os.path.join(tmp_dir, f"page_{page_index}.tif")
+            _render_ocr_image(pdf_document.load_page(page_index)).save(path, format="TIFF")
+            paths.append(path)
+        list_path = os.path.join(tmp_dir, "images.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(paths))
+        output = pytesseract.image_to_string(list_path, lang="eng")
+
+    texts = output.split("\f")
+    if len(texts) < len(page_indices):
+        return None
+    return texts[:len(page_indices)]
+
+def _ocr_pages(pdf_source: Union[bytes, str], page_indices: List[int]) -> Tuple[List[Tuple[int, str]], Optional[str]]:
+    """
+    Process-pool entry point: render a batch of PDF pages and OCR them
+
+    Module-level so it can be pickled; pdf_source is a file path or the PDF bytes.
+    Returns (page_index, text) pairs and an error message, or None if OCR succeeded.
+    Errors are returned rather than raised: exceptions like pytesseract's
+    TesseractNotFoundError don't unpickle in the parent and would break the pool.
+    """
+    try:
+        if isinstance(pdf_source, str):
+            pdf_document = fitz.open(pdf_source)
+        else:
+            pdf_document = fitz.open(stream=pdf_source, filetype="pdf")
+        try:
+            texts = None
+            if PyTessBaseAPI is None and len(page_indices) >= OCR_LIST_FILE_MIN_PAGES:
+                texts = _ocr_list_file(pdf_document, page_indices)
+            if texts is None:
+                texts = [_ocr_image(_render_ocr_image(pdf_document.load_page(i))) for i in page_indices]
+        finally:
+            pdf_document.close()
+    except Exception as e:
+        return [(page_index, "") for page_index in page_indices], f"{type(e).__name__}: {e}"
+    return list(zip(page_indices, texts)), None
@@ -5,6 +5,7 @@ Multimodal RAG Workbench Backend Startup Script
 
 import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 # Add current directory to Python path
@@ -15,6 +16,8 @@ sys.path.insert(0, str(current_dir))
 from env_config import setup_environment
 setup_environment()
 
+from config import SERVER_WORKERS
+
 def check_environment():
     """Check environment configuration"""
     print("🔍 Checking environment configuration...")
@@ -85,8 +88,17 @@ def main():
             "-m", "uvicorn",
             "main:app",
             "--host", "localhost",
-            "--port", "8000"
+            "--port", "8000",
+            "--timeout-keep-alive", "75",
+            "--limit-concurrency", "256"
         ]
+        # uvloop is not available on Windows; uvicorn falls back to asyncio
+        if find_spec("uvloop"):
+            cmd += ["--loop", "uvloop"]
+        if find_spec("httptools"):
+            cmd += ["--http", "httptools"]
+        if SERVER_WORKERS > 1:
+            cmd += ["--workers", str(SERVER_WORKERS)]
 
         print(f"🚀 Executing command: {' '.join(cmd)}")
         subprocess.run(cmd, check=True)
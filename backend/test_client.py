@@ -8,7 +8,7 @@ import httpx
 import json
 from typing import AsyncGenerator
 
-async def test_streaming_chat():
+async def test_streaming_chat(client: httpx.AsyncClient):
     """Test streaming chat interface"""
     print("🧪 Testing streaming chat interface...")
 
@@ -23,46 +23,45 @@ async def test_streaming_chat():
     }
     
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            async with client.stream(
-                "POST",
-                url,
-                json=test_data,
-                headers={"Accept": "text/event-stream"}
-            ) as response:
-
-                print(f"Status code: {response.status_code}")
-                print("=" * 50)
-                print("📨 Streaming response:")
-
-                full_content = ""
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        try:
-                            data = json.loads(line[6:])  # Remove "data: " prefix
-
-                            if data["type"] == "content_delta":
-                                content = data["content"]
-                                print(content, end="", flush=True)
-                                full_content += content
-                            elif data["type"] == "message_complete":
-                                print("\n" + "=" * 50)
-                                print(f"✅ Response complete")
-                                print(f"📄 Full content length: {len(data['full_content'])} characters")
-                                break
-                            elif data["type"] == "error":
-                                print(f"\n❌ Error: {data['error']}")
-                                break
-
-                        except json.JSONDecodeError:
-                            continue
-
-                print(f"\n✅ Test complete")
+        async with client.stream(
+            "POST",
+            url,
+            json=test_data,
+            headers={"Accept": "text/event-stream"}
+        ) as response:
+
+            print(f"Status code: {response.status_code}")
+            print("=" * 50)
+            print("📨 Streaming response:")
+
+            full_content = ""
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    try:
+                        data = json.loads(line[6:])  # Remove "data: " prefix
+
+                        if data["type"] == "content_delta":
+                            content = data["content"]
+                            print(content, end="", flush=True)
+                            full_content += content
+                        elif data["type"] == "message_complete":
+                            print("\n" + "=" * 50)
+                            print(f"✅ Response complete")
+                            print(f"📄 Full content length: {len(data['full_content'])} characters")
+                            break
+                        elif data["type"] == "error":
+                            print(f"\n❌ Error: {data['error']}")
+                            break
+
+                    except json.JSONDecodeError:
+                        continue
+
+            print(f"\n✅ Test complete")
 
     except Exception as e:
         print(f"❌ Test failed: {e}")
 
-async def test_sync_chat():
+async def test_sync_chat(client: httpx.AsyncClient):
     """Test synchronous chat interface"""
     print("\n🧪 Testing synchronous chat interface...")
 
@@ -76,40 +75,38 @@ async def test_sync_chat():
     }
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, json=test_data)
-
-            print(f"Status code: {response.status_code}")
-            if response.status_code == 200:
-                result = response.json()
-                print("📨 Synchronous response:")
-                print(f"Role: {result['role']}")
-                print(f"Timestamp: {result['timestamp']}")
-                print(f"Content: {result['content']}")
-                print("✅ Test complete")
-            else:
-                print(f"❌ Response error: {response.text}")
+        response = await client.post(url, json=test_data)
+
+        print(f"Status code: {response.status_code}")
+        if response.status_code == 200:
+            result = response.json()
+            print("📨 Synchronous response:")
+            print(f"Role: {result['role']}")
+            print(f"Timestamp: {result['timestamp']}")
+            print(f"Content: {result['content']}")
+            print("✅ Test complete")
+        else:
+            print(f"❌ Response error: {response.text}")
 
     except Exception as e:
         print(f"❌ Test failed: {e}")
 
-async def test_health():
+async def test_health(client: httpx.AsyncClient):
     """Test health check endpoint"""
     print("🧪 Testing health check endpoint...")
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://localhost:8000/")
-
-            print(f"Status code: {response.status_code}")
-            if response.status_code == 200:
-                result = response.json()
-                print("📊 Service status:")
-                for key, value in result.items():
-                    print(f"  {key}: {value}")
-                print("✅ Service running normally")
-            else:
-                print(f"❌ Service abnormal: {response.text}")
+        response = await client.get("http://localhost:8000/")
+
+        print(f"Status code: {response.status_code}")
+        if response.status_code == 200:
+            result = response.json()
+            print("📊 Service status:")
+            for key, value in result.items():
+                print(f"  {key}: {value}")
+            print("✅ Service running normally")
+        else:
+            print(f"❌ Service abnormal: {response.text}")
 
     except Exception as e:
         print(f"❌ Connection failed: {e}")
@@ -120,14 +117,16 @@ async def main():
     print("🚀 Starting API interface testing")
     print("=" * 60)
 
-    # Test health check
-    await test_health()
+    # One client for all tests so the connection pool is reused between them
+    async with httpx.AsyncClient(timeout=60.0, http2=True) as client:
+        # Test health check
+        await test_health(client)
 
-    # Test synchronous interface
-    await test_sync_chat()
+        # Test synchronous interface
+        await test_sync_chat(client)
 
-    # Test streaming interface
-    await test_streaming_chat()
+        # Test streaming interface
+        await test_streaming_chat(client)
 
     print("\n🎉 All tests complete!")
 
@@ -1,15 +1,16 @@
 import os
-import json
 import asyncio
+from functools import lru_cache
 from typing import List, Dict, Any, AsyncGenerator
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 from loguru import logger
+import orjson
 
 # LangChain 1.0 imports
 from langchain.chat_models import init_chat_model
@@ -23,12 +24,29 @@ from config import settings
 load_dotenv(override=True)
 
 # Configure logging
-logger.add(settings.log_file, rotation="500 MB", level=settings.log_level)
+logger.add(settings.log_file, rotation="500 MB", level=settings.log_level, enqueue=True)
+
+# SSE framing, pre-encoded once
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+# Buffered content is flushed at a sentence delimiter, or once it reaches
+# SSE_FLUSH_CHARS characters or has waited SSE_FLUSH_INTERVAL seconds
+SSE_FLUSH_CHARS = 32
+SSE_FLUSH_INTERVAL = 0.03
+
+# Sentence/phrase delimiters that trigger an early flush
+_DELIMS = frozenset(".。!！?？\n")
+
+def _sse(data: Dict[str, Any]) -> bytes:
+    """Encode a payload as one SSE data frame"""
+    return _SSE_PREFIX + orjson.dumps(data) + _SSE_SUFFIX
 
 app = FastAPI(
     title="Multimodal RAG Workbench API",
     description="Intelligent conversation API based on LangChain 1.0",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration
@@ -64,33 +82,39 @@ class StreamingCallbackHandler(AsyncCallbackHandler):
         self.tokens.append(token)
         self.current_chunk += token
 
+@lru_cache(maxsize=16)
+def _build_model(model_name: str, temperature: float, max_tokens: int, api_key: str, base_url: str):
+    """Build a chat model once per configuration, so its HTTP connection pool is reused across requests"""
+    # Use LangChain 1.0's new way to initialize model
+    return init_chat_model(
+        f"openai:{model_name}",
+        api_key=api_key,
+        base_url=base_url,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        streaming=True
+    )
+
 # Initialize chat model
 def get_chat_model(model_name: str = None):
-    """Initialize chat model"""
+    """Initialize chat model (cached per configuration)"""
     if model_name is None:
         model_name = settings.default_model
         
     try:
-        # Use LangChain 1.0's new way to initialize model
-        model = init_chat_model(
-            f"openai:{model_name}",
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url,
-            temperature=settings.temperature,
-            max_tokens=settings.max_tokens,
-            streaming=True
+        return _build_model(
+            model_name,
+            settings.temperature,
+            settings.max_tokens,
+            settings.openai_api_key,
+            settings.openai_base_url
         )
-        return model
     except Exception as e:
-        logger.error(f"Model initialization failed: {e}")
+        logger.error("Model initialization failed: {}", e)
         raise HTTPException(status_code=500, detail=f"Model initialization failed: {str(e)}")
 
-def convert_history_to_messages(history: List[Dict[str, Any]]) -> List[BaseMessage]:
-    """Convert history to LangChain message format"""
-    messages = []
-
-    # Add system message
-    system_prompt = """You are a professional multimodal RAG assistant with the following capabilities:
+# System prompt shared by every chat request
+_SYSTEM_PROMPT = """You are a professional multimodal RAG assistant with the following capabilities:
 1. Document understanding and analysis
 2. Image content recognition
 3. Audio transcription and analysis
@@ -98,21 +122,27 @@ def convert_history_to_messages(history: List[Dict[str, Any]]) -> List[BaseMessa
 
 Please answer user questions in a professional and friendly manner, providing detailed explanations when needed."""
 
-    messages.append(SystemMessage(content=system_prompt))
+_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT)
+
+# History role -> LangChain message class; other roles are ignored
+_ROLE_TO_MESSAGE = {"user": HumanMessage, "assistant": AIMessage}
+
+def convert_history_to_messages(history: List[Dict[str, Any]]) -> List[BaseMessage]:
+    """Convert history to LangChain message format"""
+    messages = [_SYSTEM_MESSAGE]
 
     # Convert history messages
     for msg in history:
-        if msg["role"] == "user":
-            messages.append(HumanMessage(content=msg["content"]))
-        elif msg["role"] == "assistant":
-            messages.append(AIMessage(content=msg["content"]))
-    
+        message_cls = _ROLE_TO_MESSAGE.get(msg["role"])
+        if message_cls is not None:
+            messages.append(message_cls(content=msg["content"]))
+
     return messages
 
 async def generate_streaming_response(
     messages: List[BaseMessage],
     model_name: str
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Generate streaming response"""
     try:
         model = get_chat_model(model_name)
@@ -121,57 +151,45 @@ async def generate_streaming_response(
         full_response = ""
         chunk_buffer = ""
 
+        loop = asyncio.get_running_loop()
+        last_flush = loop.time()
+
         async for chunk in model.astream(messages):
             if hasattr(chunk, 'content') and chunk.content:
                 content = chunk.content
                 full_response += content
                 chunk_buffer += content
 
-                # Send chunks by sentence or phrase
-                if any(delimiter in chunk_buffer for delimiter in ['.', '。', '!', '！', '?', '？', '\n']):
-                    # Construct SSE format data
-                    data = {
-                        "type": "content_delta",
-                        "content": chunk_buffer,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+                # Send chunks by sentence or phrase, or when the buffer is large or stale.
+                # The buffer is emptied at every delimiter, so only the new token needs checking.
+                if (not _DELIMS.isdisjoint(content)
+                        or len(chunk_buffer) >= SSE_FLUSH_CHARS
+                        or loop.time() - last_flush >= SSE_FLUSH_INTERVAL):
+                    yield _sse({"type": "content_delta", "content": chunk_buffer})
                     chunk_buffer = ""
-                else:
-                    # Send individual character
-                    data = {
-                        "type": "content_delta",
-                        "content": content,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+                    last_flush = loop.time()
 
         # Send remaining content
         if chunk_buffer:
-            data = {
-                "type": "content_delta",
-                "content": chunk_buffer,
-                "timestamp": datetime.now().isoformat()
-            }
-            yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+            yield _sse({"type": "content_delta", "content": chunk_buffer})
 
         # Send completion signal
         final_data = {
             "type": "message_complete",
             "full_content": full_response,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),  # orjson emits the same ISO format natively
             "references": []  # Empty for now, can add RAG references later
         }
-        yield f"data: {json.dumps(final_data, ensure_ascii=False)}\n\n"
+        yield _sse(final_data)
 
     except Exception as e:
-        logger.error(f"Streaming response generation failed: {e}")
+        logger.error("Streaming response generation failed: {}", e)
         error_data = {
             "type": "error",
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
-        yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
+        yield _sse(error_data)
 
 @app.get("/")
 async def root():
@@ -187,7 +205,7 @@ async def root():
 async def chat_stream(request: MessageRequest):
     """Streaming chat endpoint"""
     try:
-        logger.info(f"Received chat request: {request.content[:100]}...")
+        logger.info("Received chat request: {}...", request.content[:100])
 
         # Convert message history
         messages = convert_history_to_messages(request.history)
@@ -207,14 +225,14 @@ async def chat_stream(request: MessageRequest):
         )
 
     except Exception as e:
-        logger.error(f"Chat request processing failed: {e}")
+        logger.error("Chat request processing failed: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/chat")
 async def chat_sync(request: MessageRequest):
     """Synchronous chat endpoint (non-streaming)"""
     try:
-        logger.info(f"Received synchronous chat request: {request.content[:100]}...")
+        logger.info("Received synchronous chat request: {}...", request.content[:100])
 
         # Convert message history
         messages = convert_history_to_messages(request.history)
@@ -232,7 +250,7 @@ async def chat_sync(request: MessageRequest):
         )
 
     except Exception as e:
-        logger.error(f"Synchronous chat request processing failed: {e}")
+        logger.error("Synchronous chat request processing failed: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/models")
@@ -736,26 +736,16 @@ export default function App() {
     });
 
     try {
-      // Convert PDF to base64
-      const reader = new FileReader();
-      const fileData = await new Promise<string>((resolve, reject) => {
-        reader.onload = (e) => resolve(e.target?.result as string);
-        reader.onerror = reject;
-        reader.readAsDataURL(pdfFile.file);
-      });
+      // Upload the PDF as multipart form data (no base64 inflation)
+      const formData = new FormData();
+      formData.append('file', pdfFile.file, pdfFile.file.name);
 
       console.log('📤 Calling PDF processing API');
 
       // Call PDF processing API
       const response = await fetch('http://localhost:8000/api/pdf/process', {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          content: fileData,
-          filename: pdfFile.file.name
-        })
+        body: formData
       });
 
       if (!response.body) {
@@ -17,7 +17,7 @@ export interface StreamingResponse {
   content?: string;
   full_content?: string;
   error?: string;
-  timestamp: string;
+  timestamp?: string;
   references?: Array<any>;
 }
 
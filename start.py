@@ -5,6 +5,7 @@ Multimodal RAG Workbench Backend Startup Script
 
 import os
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 # Add current directory to Python path
@@ -76,13 +77,19 @@ def main():
     try:
         from backend.main import app
         import uvicorn
-        from backend.config import settings
+        from backend.config import settings, SERVER_WORKERS
 
+        # uvloop is not available on Windows; fall back to uvicorn's defaults there
         uvicorn.run(
             "backend.main:app",
             host=settings.host,
             port=settings.port,
             log_level=settings.log_level.lower(),
+            loop="uvloop" if find_spec("uvloop") else "auto",
+            http="httptools" if find_spec("httptools") else "auto",
+            timeout_keep_alive=75,
+            limit_concurrency=256,
+            workers=SERVER_WORKERS,
             reload=settings.debug
         )
     except KeyboardInterrupt: